@@ -0,0 +1,232 @@
+import os
+import re
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+# 공지 본문/첨부파일 보관소 (DUID 기준 한 줄)
+#  modified: 목록에 보이는 수정일 — 이 값이 바뀐 글만 본문을 다시 가져옴
+#  content_hash: 본문+첨부 목록 해시 — 다시 가져온 내용이 실제로 바뀌었는지 비교
+#  modified가 PENDING이면 상세 페이지를 못 가져온 글 → 다음 실행에서 (목록이 그대로여도) 다시 가져옴
+#
+# 검색 색인 (posts + posts_fts)
+#  두 모니터가 본 모든 글(공지/기숙사)을 지우지 않고 쌓아두고, FTS5 trigram(3글자 n-gram)으로
+#  제목/본문을 색인합니다. 한국어는 띄어쓰기/조사와 상관없이 글자 조각으로 찾는 게 잘 맞습니다.
+ARCHIVE_DB = os.environ.get('ARCHIVE_DB', 'archive.db')
+
+PENDING = "pending"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notices (
+    duid INTEGER PRIMARY KEY,
+    title TEXT,
+    link TEXT,
+    modified TEXT,
+    body TEXT,
+    attachments TEXT,
+    content_hash TEXT,
+    fetched_at TEXT
+);
+CREATE INDEX IF NOT EXISTS notices_modified ON notices (modified);
+"""
+
+POSTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    key TEXT NOT NULL,
+    title TEXT,
+    category TEXT,
+    department TEXT,
+    posted TEXT,
+    link TEXT,
+    body TEXT,
+    UNIQUE (source, key)
+);
+CREATE INDEX IF NOT EXISTS posts_posted ON posts (posted);
+"""
+
+# posts 내용이 바뀌면 트리거로 색인도 같이 갱신 (external content 테이블)
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+    title, body, content='posts', content_rowid='id', tokenize='{tokenizer}'
+);
+CREATE TRIGGER IF NOT EXISTS posts_ai AFTER INSERT ON posts BEGIN
+    INSERT INTO posts_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_ad AFTER DELETE ON posts BEGIN
+    INSERT INTO posts_fts (posts_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_au AFTER UPDATE ON posts BEGIN
+    INSERT INTO posts_fts (posts_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    INSERT INTO posts_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+"""
+
+# trigram 토크나이저는 SQLite 3.34 이상에서만 있음 (없으면 기본 토크나이저로)
+TOKENIZERS = ("trigram", "unicode61")
+
+# trigram은 3글자 이상 검색어만 색인으로 찾을 수 있음 ("장학"처럼 짧으면 LIKE로 훑음)
+MIN_FTS_QUERY = 3
+
+class Archive:
+    def __init__(self, path=ARCHIVE_DB):
+        self.path = path
+        # 상세 페이지는 여러 스레드에서 가져오지만 DB 쓰기는 락 하나로 순서대로
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.executescript(SCHEMA)
+            self.conn.executescript(POSTS_SCHEMA)
+            self.tokenizer = self._create_fts()
+
+    def _create_fts(self):
+        row = self.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'posts_fts'").fetchone()
+        if row:
+            return "trigram" if "trigram" in row[0] else "unicode61"
+        for tokenizer in TOKENIZERS:
+            try:
+                self.conn.executescript(FTS_SCHEMA.format(tokenizer=tokenizer))
+                return tokenizer
+            except sqlite3.OperationalError:
+                continue
+        raise sqlite3.OperationalError("FTS5를 사용할 수 없습니다")
+
+    def lookup(self, duids):
+        """{duid: {"modified", "content_hash", "title"}} (보관소에 있는 글만)"""
+        duids = list(duids)
+        found = {}
+        with self.lock:
+            # SQLite 변수 개수 제한 때문에 나눠서 조회
+            for start in range(0, len(duids), 500):
+                chunk = duids[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT duid, modified, content_hash, title FROM notices WHERE duid IN ({marks})", chunk)
+                for duid, modified, content_hash, title in rows:
+                    found[duid] = {"modified": modified, "content_hash": content_hash, "title": title}
+        return found
+
+    def remember(self, duid, title, link, modified):
+        """본문은 가져오지 않고 수정일만 기억 (다음에 수정일이 바뀌면 그때 본문을 가져옴)
+
+        이미 있는 글은 그대로 두고, 제목 없이 저장된 글이면 제목만 채움
+        """
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO notices (duid, title, link, modified) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (duid) DO UPDATE SET title = excluded.title "
+                "WHERE notices.title IS NULL AND excluded.title IS NOT NULL",
+                (duid, title, link, modified))
+
+    def mark_pending(self, duid, title, link):
+        """상세 페이지를 못 가져온 글 (이미 있는 줄이면 본문/해시는 그대로 두고 수정일만 PENDING으로)"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO notices (duid, title, link, modified) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (duid) DO UPDATE SET modified = excluded.modified",
+                (duid, title, link, PENDING))
+
+    def pending(self):
+        """다시 가져와야 하는 글 [dict(duid, title, link, content_hash)]"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT duid, title, link, content_hash FROM notices WHERE modified = ?", (PENDING,)).fetchall()
+        return [dict(zip(("duid", "title", "link", "content_hash"), row)) for row in rows]
+
+    def store(self, duid, title, link, modified, body, attachments, content_hash):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO notices "
+                "(duid, title, link, modified, body, attachments, content_hash, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (duid, title, link, modified, body, json.dumps(attachments, ensure_ascii=False),
+                 content_hash, datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")))
+
+    def index_posts(self, source, posts):
+        """본 글들을 검색 색인에 추가 (이미 있고 내용이 같으면 아무것도 안 함 → 매 실행 부담 없음)
+
+        posts: dict(key, title, category, department, posted, link)
+        """
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO posts (source, key, title, category, department, posted, link) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (source, key) DO UPDATE SET "
+                "title = excluded.title, category = excluded.category, department = excluded.department, "
+                "posted = COALESCE(excluded.posted, posts.posted), link = excluded.link "
+                "WHERE posts.title IS NOT excluded.title OR posts.link IS NOT excluded.link "
+                "OR posts.department IS NOT excluded.department",
+                [(source, str(p["key"]), p.get("title"), p.get("category"), p.get("department"),
+                  p.get("posted"), p.get("link")) for p in posts])
+
+    def titled_keys(self, source, keys):
+        """색인에 제목과 함께 들어 있는 글의 키 집합"""
+        keys = [str(key) for key in keys]
+        found = set()
+        with self.lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT key FROM posts WHERE source = ? AND title IS NOT NULL AND key IN ({marks})",
+                    [source] + chunk)
+                found.update(key for key, in rows)
+        return found
+
+    def index_body(self, source, key, body):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE posts SET body = ? WHERE source = ? AND key = ? AND body IS NOT ?",
+                (body, source, str(key), body))
+
+    def search(self, query, limit=20, source=None):
+        """제목/본문 검색 (띄어쓴 단어는 모두 포함) → 최신 글부터 [dict(source, title, ...)]"""
+        columns = "p.source, p.title, p.category, p.department, p.posted, p.link"
+        terms = query.split()
+        use_fts = self.tokenizer == "trigram"
+        fts_terms = [t for t in terms if use_fts and len(t) >= MIN_FTS_QUERY]
+        like_terms = [t for t in terms if t not in fts_terms]
+
+        where, params = [], []
+        if fts_terms:
+            sql = f"SELECT {columns} FROM posts_fts f JOIN posts p ON p.id = f.rowid"
+            where.append("posts_fts MATCH ?")
+            # 따옴표로 감싸서 검색어 안의 특수문자(-, : 등)를 문법이 아닌 글자로 취급
+            params.append(" AND ".join('"' + t.replace('"', '""') + '"' for t in fts_terms))
+        else:
+            sql = f"SELECT {columns} FROM posts p"
+        for term in like_terms:
+            where.append("(p.title LIKE ? OR p.body LIKE ?)")
+            params.extend([f"%{term}%"] * 2)
+        if source:
+            where.append("p.source = ?")
+            params.append(source)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY p.posted DESC, p.id DESC LIMIT ?"
+        params.append(limit)
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        keys = ("source", "title", "category", "department", "posted", "link")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def close(self):
+        self.conn.close()
+
+def title_category(title):
+    """제목 앞의 [머리말] (예: "[학사] ..." → "학사")"""
+    found = re.match(r'\s*\[([^\]]+)\]', title or "")
+    return found.group(1).strip() if found else None
+
+_archive = None
+_archive_lock = threading.Lock()
+
+def open_archive():
+    """프로세스 안에서는 연결 하나를 계속 재사용 (데몬 모드, 여러 소스가 동시에 열어도 하나)"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = Archive()
+        return _archive
@@ -0,0 +1,217 @@
+"""추출 경로 벤치마크 (네트워크 없이, 저장해 둔 응답으로 측정)
+
+benchmarks/fixtures 의 응답을 실제 크기(x1)와 100배로 키운 크기(x100)로 각 봇의
+추출 함수에 넣고 시간을 잽니다. 결과는 한 줄에 하나씩 JSON으로 출력되어,
+이전 결과(--baseline)와 비교하면 느려진 항목을 바로 찾을 수 있습니다.
+
+픽스처는 실제 응답 형식을 따라 만든 합성 데이터입니다 (dorm_getBbsList.json 포함).
+실제 응답으로 재려면 benchmarks/capture_fixtures.py 로 녹화해서 덮어쓰세요.
+합성/녹화 픽스처로 잰 결과끼리는 --baseline 으로 비교하지 마세요.
+
+    python benchmarks/bench_extract.py -o bench.jsonl
+    python benchmarks/bench_extract.py --baseline bench.jsonl   # 기준보다 느려지면 exit 1
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import platform
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import monitor
+import dorm_monitor
+import calendar_bot
+import calendar_index
+import html_backend
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SCALES = (1, 100)
+
+# 기준 대비 이 비율 이상 느려지면 회귀로 봄
+DEFAULT_TOLERANCE = 0.25
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+def repeat_inner(markup, open_tag, close_tag, scale, start_marker="", copy=None):
+    """open_tag ~ close_tag 사이 내용을 scale배로 늘린 문서를 만듦 (copy(내용, i)로 복사본마다 바꿀 수 있음)"""
+    start = markup.index(open_tag, markup.index(start_marker) if start_marker else 0) + len(open_tag)
+    end = markup.index(close_tag, start)
+    inner = markup[start:end]
+    body = "".join(copy(inner, i) for i in range(scale)) if copy else inner * scale
+    return markup[:start] + body + markup[end:]
+
+def distinct_duids(scale):
+    """복사본마다 DUID가 다르고 뒤 복사본일수록 오래된 글이 되도록 (같은 DUID가 반복되면 조기 종료가 안 됨)"""
+    def copy(inner, i):
+        return re.sub(r'DUID=(\d+)', lambda found: f"DUID={int(found.group(1)) + 1000 * (scale - 1 - i)}", inner)
+    return copy
+
+def scale_dorm(doc, scale):
+    scaled = json.loads(json.dumps(doc))
+    rows = scaled["data"]["list"]
+    scaled["data"]["list"] = [dict(row, seq=row["seq"] - 20 * i) for i in range(scale) for row in rows]
+    return scaled
+
+# ▼ 측정 대상: (이름, 입력 준비 함수(scale) → (입력, 바이트 수), 실행 함수(입력) → 처리 개수)
+
+def notice_input(scale):
+    markup = repeat_inner(read_fixture("notice.html"), "<ul>", "</ul>", scale, "board-list-box")
+    return markup, len(markup.encode("utf-8"))
+
+def notice_extract(markup):
+    return len(monitor.parse_posts(markup)[0])
+
+def notice_incremental_input(scale):
+    markup = repeat_inner(read_fixture("notice.html"), "<ul>", "</ul>", scale, "board-list-box",
+                          distinct_duids(scale))
+    # 목록 위쪽 5개만 새 글이고 나머지는 이미 본 글인 평소 상황
+    duids = [int(d) for d in re.findall(r'DUID=(\d+)', markup)]
+    return (markup, {str(d) for d in duids[5:]}), len(markup.encode("utf-8"))
+
+def notice_incremental(arg):
+    markup, seen = arg
+    # run()처럼 수정 감지용 rows도 같이 채움
+    return len(monitor.parse_posts(markup, seen, rows={})[0])
+
+def dorm_input(scale):
+    doc = scale_dorm(json.loads(read_fixture("dorm_getBbsList.json")), scale)
+    return doc, len(json.dumps(doc, ensure_ascii=False).encode("utf-8"))
+
+def dorm_discover(doc):
+    return sum(len(posts) for _, posts in dorm_monitor.discover_posts(doc))
+
+def dorm_learned_input(scale):
+    doc, size = dorm_input(scale)
+    specs = [spec for spec, _ in dorm_monitor.discover_posts(doc)]
+    return (doc, specs), size
+
+def dorm_learned(arg):
+    doc, specs = arg
+    return sum(len(posts) for _, posts in dorm_monitor.read_learned(doc, specs))
+
+def calendar_input(scale):
+    fragment = repeat_inner(read_fixture("calendar_2026_10.html"), "<ul>", "</ul>", scale)
+    return fragment, len(fragment.encode("utf-8"))
+
+def calendar_parse(fragment):
+    return len(calendar_bot.parse_calendar_fragment(fragment))
+
+def calendar_classify_input(scale):
+    fragment, size = calendar_input(scale)
+    # 중복 제거에 걸리지 않도록 복제된 일정마다 제목을 다르게 만듦
+    events = [[d, f"{t} #{i}"] for i, (d, t) in enumerate(calendar_bot.parse_calendar_fragment(fragment))]
+    return events, size
+
+def calendar_classify(events):
+    # 색인 만들기 + 조회까지 측정 (색인 파일은 쓰지 않음)
+    cache = {"2026-10": {"fetched_at": 0, "events": events}}
+    original = calendar_bot.refresh_calendar_cache, calendar_bot.get_korea_today, calendar_index.INDEX_FILE
+    calendar_bot.refresh_calendar_cache = lambda target_months, today, fetch=True: cache
+    calendar_bot.get_korea_today = lambda: date(2026, 10, 20)
+    calendar_index.INDEX_FILE = None
+    try:
+        calendar_bot.get_academic_calendar()
+    finally:
+        calendar_bot.refresh_calendar_cache, calendar_bot.get_korea_today, calendar_index.INDEX_FILE = original
+    return len(events)
+
+def menu_input(scale):
+    markup = repeat_inner(read_fixture("menu.html"), "<tbody>", "</tbody>", scale)
+    return markup, len(markup.encode("utf-8"))
+
+def menu_parse(markup):
+    week = calendar_bot.parse_menu_table(markup)
+    return sum(len(day) for day in week.values())
+
+CASES = [
+    ("monitor.parse_posts", notice_input, notice_extract),
+    ("monitor.parse_posts[incremental]", notice_incremental_input, notice_incremental),
+    ("dorm_monitor.discover_posts", dorm_input, dorm_discover),
+    ("dorm_monitor.read_learned", dorm_learned_input, dorm_learned),
+    ("calendar_bot.parse_calendar_fragment", calendar_input, calendar_parse),
+    ("calendar_bot.get_academic_calendar", calendar_classify_input, calendar_classify),
+    ("calendar_bot.parse_menu_table", menu_input, menu_parse),
+]
+
+def measure(func, arg, repeat):
+    timings = []
+    items = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = func(arg)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        "median_ms": round(timings[len(timings) // 2] * 1000, 4),
+        "min_ms": round(timings[0] * 1000, 4),
+        "max_ms": round(timings[-1] * 1000, 4),
+        "items": items,
+    }
+
+def run_cases(repeat, selected=None):
+    env = {
+        "python": platform.python_version(),
+        "parser": html_backend.default_backend(),
+        "timestamp": int(time.time()),
+    }
+    for name, make_input, func in CASES:
+        if selected and not any(re.search(s, name) for s in selected):
+            continue
+        for scale in SCALES:
+            arg, size = make_input(scale)
+            # 큰 입력은 반복 횟수를 줄여서 전체 시간을 비슷하게 맞춤
+            n = max(3, repeat // scale) if scale > 1 else repeat
+            result = {"name": name, "scale": scale, "input_bytes": size, "repeat": n}
+            result.update(measure(func, arg, n))
+            result.update(env)
+            yield result
+
+def load_results(path):
+    results = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                r = json.loads(line)
+                results[(r["name"], r["scale"])] = r
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="추출 경로 벤치마크 (JSON lines 출력)")
+    parser.add_argument("-n", "--repeat", type=int, default=30)
+    parser.add_argument("-k", "--select", action="append", help="이름이 정규식과 맞는 항목만 실행")
+    parser.add_argument("-o", "--output", help="결과를 저장할 JSON lines 파일")
+    parser.add_argument("--baseline", help="비교할 이전 결과 파일")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    baseline = load_results(args.baseline) if args.baseline else {}
+    out = open(args.output, "w", encoding="utf-8") if args.output else None
+    regressions = []
+
+    for result in run_cases(args.repeat, args.select):
+        line = json.dumps(result, ensure_ascii=False)
+        print(line)
+        if out:
+            out.write(line + "\n")
+
+        base = baseline.get((result["name"], result["scale"]))
+        if base and result["median_ms"] > base["median_ms"] * (1 + args.tolerance):
+            regressions.append((result, base))
+
+    if out:
+        out.close()
+
+    for result, base in regressions:
+        print(f"⚠️ 느려짐: {result['name']} x{result['scale']} "
+              f"{base['median_ms']:.3f}ms → {result['median_ms']:.3f}ms", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
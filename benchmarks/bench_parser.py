@@ -0,0 +1,79 @@
+"""HTML 파서 백엔드별 파싱 시간 측정
+
+benchmarks/fixtures 의 페이지를 설치된 백엔드마다 파싱하고,
+각 봇이 실제로 쓰는 셀렉터까지 실행한 시간을 페이지당 ms로 보여줍니다.
+
+기본 픽스처(notice/menu/calendar)는 KW 페이지 구조를 따라 만든 합성 페이지라서
+실제 페이지와 크기·잡음(스크립트, 메뉴 등)이 다릅니다. 실제 응답으로 재려면
+benchmarks/capture_fixtures.py 로 녹화해서 덮어쓰세요.
+
+    python benchmarks/bench_parser.py [-n 반복횟수] [페이지.html ...]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import html_backend
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# 페이지 종류별로 봇이 실제 사용하는 추출 셀렉터
+SELECTORS = {
+    "notice": [".board-list-box ul li", "div.board-text > a", "p.info"],
+    "menu": ["table.tbl-list", "thead th", "tbody tr", "td"],
+    "calendar": ["li", "strong", "p"],
+}
+
+def page_kind(path):
+    name = os.path.basename(path)
+    for kind in SELECTORS:
+        if name.startswith(kind):
+            return kind
+    return "notice"
+
+def extract(root, selectors):
+    # 첫 셀렉터로 목록을 고르고, 각 항목에서 나머지 셀렉터 + 텍스트 추출
+    count = 0
+    for node in root.select(selectors[0]):
+        for sel in selectors[1:]:
+            for sub in node.select(sel):
+                sub.get_text("|", strip=True)
+                count += 1
+    return count
+
+def bench(markup, backend, selectors, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        root = html_backend.parse(markup, backend)
+        extract(root, selectors)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 파서 백엔드 벤치마크")
+    parser.add_argument("pages", nargs="*", help="측정할 HTML 파일 (기본: benchmarks/fixtures/*.html)")
+    parser.add_argument("-n", "--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = args.pages or sorted(
+        os.path.join(FIXTURE_DIR, f) for f in os.listdir(FIXTURE_DIR) if f.endswith(".html")
+    )
+    backends = html_backend.available_backends()
+
+    print(f"{'page':<28}{'size':>9}" + "".join(f"{b:>14}" for b in backends))
+    for path in pages:
+        with open(path, "r", encoding="utf-8") as f:
+            markup = f.read()
+        selectors = SELECTORS[page_kind(path)]
+        row = f"{os.path.basename(path):<28}{len(markup.encode('utf-8')) // 1024:>7}KB"
+        for backend in backends:
+            row += f"{bench(markup, backend, selectors, args.repeat):>12.2f}ms"
+        print(row)
+
+if __name__ == "__main__":
+    main()
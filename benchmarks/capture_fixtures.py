@@ -0,0 +1,80 @@
+"""실제 KW 응답을 받아서 benchmarks/fixtures 에 녹화
+
+저장소에 들어 있는 픽스처는 실제 페이지 구조(board-list-box, tbl-list, list5_detail 조각)를
+따라 손으로 만든 합성 페이지이고, 기숙사 응답(getBbsList.do)도 같은 형식의 합성 JSON입니다.
+학교 페이지가 바뀌었거나 실제 응답으로 벤치마크를 돌리고 싶으면 이 스크립트로 덮어쓴 뒤
+측정하세요. (요청은 페이지당 한 번씩만 보냄)
+
+    python benchmarks/capture_fixtures.py                 # 전부
+    python benchmarks/capture_fixtures.py notice dorm     # 일부만
+    python benchmarks/capture_fixtures.py -o /tmp/fixtures --month 2026-10
+"""
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_client
+import monitor
+import dorm_monitor
+import calendar_bot
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def capture_notice(month):
+    res = http_client.get(monitor.TARGET_URL, headers=monitor.HEADERS)
+    res.raise_for_status()
+    return "notice.html", res.text
+
+def capture_menu(month):
+    res = http_client.get(calendar_bot.MENU_URL)
+    res.raise_for_status()
+    return "menu.html", res.text
+
+def capture_calendar(month):
+    year, mon = month
+    res = http_client.post(calendar_bot.CALENDAR_API_URL, data={'sy': str(year), 'sm': str(mon)}, idempotent=True)
+    res.raise_for_status()
+    return f"calendar_{year}_{mon:02d}.html", res.text
+
+def capture_dorm(month):
+    # 기준점 잡을 때와 같은 크기(20개)로 1페이지를 받아서 보기 좋게 다시 씀
+    res = dorm_monitor.request_page(1, dorm_monitor.BASELINE_ROWS)
+    return "dorm_getBbsList.json", json.dumps(res.json(), ensure_ascii=False, indent=2) + "\n"
+
+# 이름 → 녹화 함수(month) → (파일 이름, 내용)
+CAPTURES = {
+    "notice": capture_notice,
+    "menu": capture_menu,
+    "calendar": capture_calendar,
+    "dorm": capture_dorm,
+}
+
+def parse_month(value):
+    year, month = value.split("-")
+    return int(year), int(month)
+
+def main():
+    parser = argparse.ArgumentParser(description="실제 응답을 벤치마크 픽스처로 녹화")
+    parser.add_argument("pages", nargs="*", metavar="page", help=f"녹화할 페이지 ({', '.join(CAPTURES)}), 생략하면 전부")
+    parser.add_argument("-o", "--output", default=FIXTURE_DIR, help="저장할 디렉터리")
+    # bench_extract / loadtest 가 calendar_2026_10.html 을 읽으므로 기본값은 그 달
+    parser.add_argument("--month", type=parse_month, default=(2026, 10), help="학사일정 달 (YYYY-MM)")
+    args = parser.parse_args()
+
+    unknown = [page for page in args.pages if page not in CAPTURES]
+    if unknown:
+        parser.error(f"알 수 없는 페이지: {', '.join(unknown)} (가능: {', '.join(CAPTURES)})")
+
+    os.makedirs(args.output, exist_ok=True)
+    for page in args.pages or list(CAPTURES):
+        name, text = CAPTURES[page](args.month)
+        path = os.path.join(args.output, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"💾 {page} → {path} ({len(text.encode('utf-8')) // 1024}KB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+"""끝까지(end-to-end) 부하 테스트: 가짜 KW / 텔레그램 서버를 띄우고 실제 run()을 돌림
+
+실제 사이트에 부담을 주지 않고, 글이 몰릴 때(burst)와 학교 서버가 불안정할 때(outage)
+봇이 놓치는 글 없이 알림을 보내는지, 얼마나 빨리 보내는지 확인합니다.
+
+  - 가짜 KW 서버: notice.jsp(목록/상세), getBbsList.do, list5_detail.jsp, facility11.jsp
+    글 수 / 응답 지연 / 오류(503) 비율을 바꿀 수 있음
+  - 가짜 텔레그램: sendMessage — 실제처럼 채팅방당 초당 1건, 전체 초당 30건을 넘으면 429
+
+상태 파일(seen.log, archive.db ...)은 임시 디렉터리에 만들어지므로 저장소는 건드리지 않습니다.
+127.0.0.1 밖으로 나가는 요청은 보내지 않고 막은 뒤, 하나라도 있으면 실패(exit 1)로 끝납니다.
+
+    python benchmarks/loadtest.py
+    python benchmarks/loadtest.py --posts 5000 --burst 200 --chats 20 --error-rate 0.3 --latency 0.2
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+from datetime import date
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+sys.path.insert(0, ROOT)
+
+TOKEN = "loadtest"
+MAIN_CHAT = "1000"
+PAGE_SIZE = 50
+PINNED = 3
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+# ▼ 가짜 KW 서버 ▼
+
+class FakeKW:
+    """공지/기숙사 글을 메모리에 들고, 실제 사이트와 같은 형식으로 응답"""
+
+    def __init__(self, posts):
+        self.lock = threading.Lock()
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.requests = {}
+        self.notices = []   # 최신 글이 앞
+        self.dorm = []
+        self.next_duid = 60000
+        self.next_seq = 9000
+        self.publish_notices(posts)
+        self.publish_dorm(posts)
+
+    def publish_notices(self, n):
+        today = date.today().isoformat()
+        with self.lock:
+            new = []
+            for _ in range(n):
+                self.next_duid += 1
+                duid = self.next_duid
+                new.append({"duid": duid, "title": f"[학사] 부하 테스트 공지 #N{duid}", "date": today})
+            self.notices = new[::-1] + self.notices
+        return [f"N{p['duid']}" for p in new]
+
+    def publish_dorm(self, n):
+        today = date.today().isoformat()
+        with self.lock:
+            new = []
+            for _ in range(n):
+                self.next_seq += 1
+                new.append({"seq": self.next_seq, "subject": f"기숙사 부하 테스트 #D{self.next_seq}", "regdate": today})
+            self.dorm = new[::-1] + self.dorm
+        return [f"D{p['seq']}" for p in new]
+
+    def count(self, name):
+        with self.lock:
+            self.requests[name] = self.requests.get(name, 0) + 1
+
+    def notice_list(self, page):
+        with self.lock:
+            # 고정 공지는 오래된 글 몇 개가 매 페이지 맨 위에 보임
+            pinned = self.notices[-PINNED:] if page == 1 else []
+            rows = pinned + self.notices[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+        items = []
+        for post in rows:
+            d = post["duid"]
+            items.append(
+                f'<li><div class="board-text">'
+                f'<a href="/ko/life/notice.jsp?BoardMode=view&amp;DUID={d}&amp;tpage={page}&amp;searchKey=1&amp;searchVal=&amp;srCategoryId=">'
+                f'{post["title"]} <span class="ico new">신규게시글</span></a></div>'
+                f'<p class="info"><span>번호 {d}</span> | <span>작성일</span> <span>{post["date"]}</span> | '
+                f'<span>수정일</span> <span>{post["date"]}</span> | <span>조회수 {random.randint(1, 999)}</span> | '
+                f'<span>학사지원팀</span></p></li>')
+        return ('<html><body><div class="board-list-box"><ul>' + "\n".join(items) +
+                '</ul></div></body></html>')
+
+    def notice_detail(self, duid):
+        return (f'<html><body><div class="board-view-box"><div class="contents">공지 {duid} 본문입니다.</div>'
+                f'<a href="/download?DUID={duid}">첨부{duid}.pdf</a></div></body></html>')
+
+    def dorm_list(self, page, rows):
+        with self.lock:
+            # 실제 API처럼 조회수(hit)는 요청할 때마다 바뀜
+            chunk = [dict(post, hit=random.randint(1, 999)) for post in self.dorm[(page - 1) * rows:page * rows]]
+        return json.dumps({"resultCode": "0000", "data": {"noticeList": chunk}}, ensure_ascii=False)
+
+def kw_handler(kw):
+    calendar = read_fixture("calendar_2026_10.html")
+    menu = read_fixture("menu.html")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def reply(self, status, body, content_type="text/html; charset=utf-8"):
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def fail_or_wait(self):
+            if kw.latency:
+                time.sleep(kw.latency * (0.5 + random.random()))
+            if kw.error_rate and random.random() < kw.error_rate:
+                kw.count("errors")
+                self.reply(503, "busy")
+                return True
+            return False
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            kw.count(url.path)
+            if self.fail_or_wait():
+                return
+            if url.path == "/ko/life/notice.jsp" and query.get("BoardMode") == "view":
+                self.reply(200, kw.notice_detail(query.get("DUID")))
+            elif url.path == "/ko/life/notice.jsp":
+                self.reply(200, kw.notice_list(int(query.get("tpage", 1))))
+            elif url.path == "/ko/life/facility11.jsp":
+                self.reply(200, menu)
+            else:
+                self.reply(404, "not found")
+
+        def do_POST(self):
+            url = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length", 0))
+            form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+            kw.count(url.path)
+            if self.fail_or_wait():
+                return
+            if url.path == "/bbs/getBbsList.do":
+                self.reply(200, kw.dorm_list(int(form.get("cPage", 1)), int(form.get("rows", 20))),
+                           "application/json; charset=utf-8")
+            elif url.path == "/KWBoard/list5_detail.jsp":
+                self.reply(200, calendar)
+            else:
+                self.reply(404, "not found")
+
+    return Handler
+
+# ▼ 가짜 텔레그램 ▼
+
+class FakeTelegram:
+    """sendMessage를 받아 기록하고, 텔레그램 전송 한도를 넘으면 429 + retry_after"""
+
+    def __init__(self, per_chat=1.0, group_interval=3.0, global_per_sec=30):
+        self.lock = threading.Lock()
+        self.per_chat = per_chat
+        self.group_interval = group_interval
+        self.global_per_sec = global_per_sec
+        self.error_rate = 0.0
+        self.last_by_chat = {}
+        self.recent = []
+        self.accepted = []   # (받은 시각, chat_id, text)
+        self.limited = 0
+        self.errors = 0
+
+    def receive(self, chat_id, text):
+        now = time.time()
+        with self.lock:
+            if self.error_rate and random.random() < self.error_rate:
+                self.errors += 1
+                return 500, {"ok": False, "description": "Internal Server Error"}
+            interval = self.group_interval if chat_id.startswith("-") else self.per_chat
+            # 실제 서버의 측정 오차를 고려해 약간 여유를 둠
+            last = self.last_by_chat.get(chat_id)
+            self.recent = [t for t in self.recent if now - t < 1.0]
+            if (last is not None and now - last < interval * 0.9) or len(self.recent) >= self.global_per_sec:
+                self.limited += 1
+                return 429, {"ok": False, "error_code": 429, "parameters": {"retry_after": 1}}
+            self.last_by_chat[chat_id] = now
+            self.recent.append(now)
+            self.accepted.append((now, chat_id, text))
+        return 200, {"ok": True, "result": {}}
+
+def telegram_handler(tg):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+            if self.path.endswith("/sendMessage"):
+                status, body = tg.receive(str(form.get("chat_id")), form.get("text", "") + form.get("reply_markup", ""))
+            else:
+                status, body = 404, {"ok": False}
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return Handler
+
+# ▼ 외부 요청 차단 ▼
+
+def block_external_requests():
+    """127.0.0.1이 아닌 곳으로 가는 requests 요청을 막고 기록 (가짜 서버 주소를 빠뜨린 곳을 찾음)"""
+    import requests
+
+    blocked = []
+    lock = threading.Lock()
+    original = requests.Session.request
+
+    def guarded(session, method, url, *args, **kwargs):
+        host = urlsplit(url).hostname
+        if host not in ("127.0.0.1", "localhost"):
+            with lock:
+                blocked.append(f"{method} {url}")
+            raise requests.ConnectionError(f"부하 테스트: 외부 요청 차단 ({url})")
+        return original(session, method, url, *args, **kwargs)
+
+    requests.Session.request = guarded
+    return blocked
+
+def start_server(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+# ▼ 시나리오 ▼
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))], 3)
+
+def deliveries(tg, since):
+    """since 이후 받은 메시지에서 (채팅방, 글 표식) → 처음 받은 시각, 그리고 중복 수"""
+    first = {}
+    duplicates = 0
+    with tg.lock:
+        accepted = [a for a in tg.accepted if a[0] >= since]
+    for received, chat_id, text in accepted:
+        for marker in set(re.findall(r"#([ND]\d+)", text)):
+            key = (chat_id, marker)
+            if key in first:
+                duplicates += 1
+            else:
+                first[key] = received
+    return first, duplicates, len(accepted)
+
+def run_phase(name, kw, tg, runner, chats, notices=0, dorm=0, pending=None):
+    """글을 올린 뒤 실제 runner.run()으로 공지+기숙사를 한 번 돌리고 결과를 dict로 반환
+
+    pending: 앞 단계에서 아직 전달되지 않은 글 표식 (이번 단계에서 따라잡았는지 확인)
+    """
+    markers = kw.publish_notices(notices) + kw.publish_dorm(dorm)
+    published_at = time.time()
+    requests_before = dict(kw.requests)
+    limited_before = tg.limited
+
+    started = time.monotonic()
+    failed = runner.run(["notice", "dorm"])
+    elapsed = time.monotonic() - started
+
+    expected = {(chat, m): published_at for chat in chats for m in markers}
+    for key, at in (pending or {}).items():
+        expected.setdefault(key, at)
+    delivered, duplicates, messages = deliveries(tg, published_at)
+    latencies = [delivered[key] - at for key, at in expected.items() if key in delivered]
+    missing = {key: at for key, at in expected.items() if key not in delivered}
+
+    kw_requests = {k: v - requests_before.get(k, 0) for k, v in kw.requests.items() if v != requests_before.get(k, 0)}
+    result = {
+        "phase": name,
+        "published": len(markers),
+        "expected_deliveries": len(expected),
+        "delivered": len(expected) - len(missing),
+        "lost": len(missing),
+        "duplicates": duplicates,
+        "messages": messages,
+        "elapsed_s": round(elapsed, 3),
+        "posts_per_s": round(len(markers) / elapsed, 1) if elapsed else None,
+        "detect_p50_s": percentile(latencies, 50),
+        "detect_p95_s": percentile(latencies, 95),
+        "detect_max_s": percentile(latencies, 100),
+        "telegram_429": tg.limited - limited_before,
+        "kw_requests": kw_requests,
+        "failed_sources": failed,
+    }
+    return result, missing
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 KW/텔레그램 서버로 실제 run()을 돌리는 부하 테스트")
+    parser.add_argument("--posts", type=int, default=2000, help="처음에 있는 공지/기숙사 글 수")
+    parser.add_argument("--burst", type=int, default=120, help="몰림 단계에서 새로 올라오는 공지 수")
+    parser.add_argument("--dorm-burst", type=int, default=40, help="몰림 단계에서 새로 올라오는 기숙사 글 수")
+    parser.add_argument("--chats", type=int, default=5, help="전체 글을 받는 구독 채팅방 수 (기본 채팅방 포함)")
+    parser.add_argument("--digest-min", type=int, default=5, help="이 개수 이상이면 묶음 메시지 (0이면 한 건씩)")
+    parser.add_argument("--latency", type=float, default=0.1, help="장애 단계의 평균 응답 지연 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.3, help="장애 단계의 503 비율")
+    parser.add_argument("--keep", action="store_true", help="임시 작업 디렉터리를 지우지 않음")
+    args = parser.parse_args()
+
+    kw = FakeKW(args.posts)
+    tg = FakeTelegram()
+    kw_server, kw_base = start_server(kw_handler(kw))
+    tg_server, tg_base = start_server(telegram_handler(tg))
+
+    workdir = tempfile.mkdtemp(prefix="kwbot-loadtest-")
+    os.chdir(workdir)
+    chats = [MAIN_CHAT] + [str(2000 + i) for i in range(args.chats - 1)]
+    with open("subscribers.json", "w", encoding="utf-8") as f:
+        json.dump({"subscribers": [{"chat_id": c, "all": True} for c in chats[1:]]}, f)
+
+    # 모듈이 import될 때 읽는 설정이라 import 전에 지정
+    os.environ.update({
+        "TELEGRAM_TOKEN": TOKEN,
+        "TELEGRAM_CHAT_ID": MAIN_CHAT,
+        "TELEGRAM_API_BASE": tg_base,
+        "TELEGRAM_DIGEST_MIN": str(args.digest_min),
+        "METRICS_LOG": os.path.join(workdir, "metrics.jsonl"),
+        "HTTP_BREAKER_COOLDOWN": "5",
+    })
+    blocked = block_external_requests()
+    import monitor
+    import dorm_monitor
+    import calendar_bot
+    import runner
+
+    monitor.SITE_URL = kw_base
+    monitor.TARGET_URL = f"{kw_base}/ko/life/notice.jsp"
+    dorm_monitor.API_URL = f"{kw_base}/bbs/getBbsList.do"
+    calendar_bot.CALENDAR_API_URL = f"{kw_base}/KWBoard/list5_detail.jsp"
+    calendar_bot.MENU_URL = f"{kw_base}/ko/life/facility11.jsp"
+
+    results = []
+    try:
+        # 1) 기준점: 첫 실행은 알림 없이 기록만
+        result, _ = run_phase("baseline", kw, tg, runner, chats)
+        results.append(result)
+
+        # 2) 새 글이 없는 평소 실행 (빠른 경로)
+        result, _ = run_phase("steady", kw, tg, runner, chats)
+        results.append(result)
+
+        # 3) 글 몰림
+        result, _ = run_phase("burst", kw, tg, runner, chats, args.burst, args.dorm_burst)
+        results.append(result)
+
+        # 4) 학교 서버 장애 (지연 + 503) 중에 새 글
+        kw.latency, kw.error_rate = args.latency, args.error_rate
+        result, missing = run_phase("outage", kw, tg, runner, chats, args.burst // 4, args.dorm_burst // 4)
+        results.append(result)
+
+        # 5) 복구 후: 장애 때 놓친 글을 따라잡는지
+        kw.latency, kw.error_rate = 0.0, 0.0
+        time.sleep(5)  # 차단기 쉬는 시간
+        result, _ = run_phase("recovery", kw, tg, runner, chats, pending=missing)
+        results.append(result)
+
+        # 6) 모닝 브리핑
+        started = time.monotonic()
+        calendar_bot.run()
+        results.append({"phase": "briefing", "elapsed_s": round(time.monotonic() - started, 3)})
+    finally:
+        kw_server.shutdown()
+        tg_server.shutdown()
+        os.chdir(ROOT)
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print()
+    for result in results:
+        print(json.dumps(result, ensure_ascii=False))
+    total_lost = results[4].get("lost", 0) if len(results) > 4 else None
+    print(f"\n📊 최종 유실 {total_lost}건 (복구 단계 기준), 작업 디렉터리: {workdir}" + ("" if args.keep else " (삭제됨)"))
+
+    if blocked:
+        print(f"❌ 가짜 서버가 아닌 곳으로 보내려던 요청 {len(blocked)}건 (차단함):")
+        for line in sorted(set(blocked))[:20]:
+            print(f"   {line}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
 import os
 import requests
 import json
-from bs4 import BeautifulSoup
 from datetime import date, datetime, timedelta
 import re
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+import html_backend
+import telegram_queue
+import fetch_cache
+import http_client
+import calendar_index
+import metrics
 
 # ▼ 설정 ▼
 CALENDAR_API_URL = "https://www.kw.ac.kr/KWBoard/list5_detail.jsp"
@@ -16,21 +23,29 @@ FEEDBACK_GROUP_URL = "https://t.me/+p-QVo1Z6e5AxNTdl"
 TOKEN = os.environ.get('TELEGRAM_TOKEN')
 CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID')
 
+# 학사일정 캐시: (연, 월)별로 파싱한 일정을 저장. 지난 달은 영구 보관, 이번 달/다음 달은 TTL 동안만 사용
+CALENDAR_CACHE_FILE = "calendar_cache.json"
+CALENDAR_CACHE_TTL = float(os.environ.get('CALENDAR_CACHE_TTL_HOURS', '72')) * 3600
+
+# 주간 식단 캐시: 한 주 식단표를 한 번만 파싱해서 날짜별로 저장
+# MENU_REVALIDATE_HOURS > 0 이면 그 주기로 페이지를 다시 받아 해시가 바뀌었는지 확인 (기본: 주가 바뀔 때만)
+MENU_CACHE_FILE = "menu_cache.json"
+MENU_REVALIDATE = float(os.environ.get('MENU_REVALIDATE_HOURS', '0')) * 3600
+
+# 마지막으로 보낸 모닝 브리핑 (명령어 봇의 /today 가 그대로 다시 씀)
+BRIEFING_FILE = "last_briefing.json"
+
 def send_telegram(message, buttons=None):
     if TOKEN and CHAT_ID:
-        try:
-            url = f"https://api.telegram.org/bot{TOKEN}/sendMessage"
-            payload = {
-                "chat_id": CHAT_ID,
-                "text": message,
-                "parse_mode": "Markdown",
-                "disable_web_page_preview": True
-            }
-            if buttons:
-                payload['reply_markup'] = json.dumps(buttons)
-            requests.post(url, data=payload)
-        except Exception as e:
-            print(f"텔레그램 전송 실패: {e}")
+        payload = {
+            "chat_id": CHAT_ID,
+            "text": message,
+            "parse_mode": "Markdown",
+            "disable_web_page_preview": True
+        }
+        if buttons:
+            payload['reply_markup'] = json.dumps(buttons)
+        telegram_queue.enqueue(payload)
 
 def get_korea_today():
     """서버 시간(UTC)에 9시간을 더해 한국 날짜를 반환"""
@@ -46,45 +61,109 @@ def get_day_kor(date_obj):
 # -----------------------------------------------------------
 # [기능 1] 학식 (Requests)
 # -----------------------------------------------------------
-def get_cafeteria_menu():
-    try:
-        # print(f"🍚 학식 정보 요청: {MENU_URL}") # 로그 줄임
-        headers = {"User-Agent": "Mozilla/5.0"}
-        res = requests.get(MENU_URL, headers=headers, verify=False, timeout=10)
-        soup = BeautifulSoup(res.text, 'html.parser')
-        
-        today_str = get_korea_today().strftime("%Y-%m-%d")
-        
-        table = soup.select_one("table.tbl-list")
-        if not table: return "❌ 식단표 없음"
+def parse_menu_table(page_html):
+    """주간 식단표 전체를 {날짜: {구분: 메뉴}} 로 변환 (표가 없으면 None)"""
+    soup = html_backend.parse(page_html)
+    
+    table = soup.select_one("table.tbl-list")
+    if not table: return None
 
-        headers = table.select("thead th")
-        target_idx = -1
-        
-        for idx, th in enumerate(headers):
-            if today_str in th.get_text():
-                target_idx = idx
-                break
-        
-        # [수정] 멘트 변경
-        if target_idx == -1:
-            return "😴 오늘은 운영하지 않아요."
+    # 헤더 칸 번호 → 날짜 (날짜가 없는 '구분' 칸 등은 건너뜀)
+    day_columns = {}
+    for idx, th in enumerate(table.select("thead th")):
+        found = re.search(r'\d{4}-\d{2}-\d{2}', th.get_text())
+        if found:
+            day_columns[idx] = found.group()
 
-        menu_rows = table.select("tbody tr")
-        menu_list = []
+    week = {day: {} for day in day_columns.values()}
+    for row in table.select("tbody tr"):
+        cols = row.select("td")
+        if not cols: continue
         
-        for row in menu_rows:
-            cols = row.select("td")
-            if len(cols) <= target_idx: continue
-            
-            category = cols[0].get_text("\n", strip=True).split("판매시간")[0].strip()
-            menu_content = cols[target_idx].get_text("\n", strip=True)
-            
+        category = cols[0].get_text("\n", strip=True).split("판매시간")[0].strip()
+        for idx, day in day_columns.items():
+            if len(cols) <= idx: continue
+            menu_content = cols[idx].get_text("\n", strip=True)
             if menu_content:
-                menu_list.append(f"🍱 *{category}*\n{menu_content}")
+                week[day][category] = menu_content
+
+    metrics.current().count("items_scanned", sum(len(menus) for menus in week.values()))
+    return week
+
+def menu_region_hash(page_html):
+    start = page_html.find("tbl-list")
+    end = page_html.find("</table>", start) if start != -1 else -1
+    region = page_html[start:end] if start != -1 and end != -1 else page_html
+    return fetch_cache.content_hash(fetch_cache.normalize_html(region))
+
+def load_menu_cache():
+    if not os.path.exists(MENU_CACHE_FILE):
+        return {}
+    try:
+        with open(MENU_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (ValueError, OSError):
+        return {}
+
+def refresh_menu_cache(cache):
+    """식단 페이지를 받아서, 표 내용이 바뀐 경우에만 다시 파싱해서 저장"""
+    res = http_client.get(MENU_URL)
+    res.raise_for_status()
+    metrics.current().count("bytes_downloaded", len(res.content))
+    metrics.current().count("menu_requests")
+
+    page_hash = menu_region_hash(res.text)
+    if cache.get("hash") == page_hash:
+        cache["checked_at"] = time.time()
+    else:
+        week = parse_menu_table(res.text)
+        if week is None:
+            return None
+        cache = {"hash": page_hash, "checked_at": time.time(), "days": week}
 
-        return "\n\n".join(menu_list) if menu_list else "🍙 등록된 식단 내용이 없습니다."
+    with open(MENU_CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=1)
+    return cache
 
+def week_end(day_str):
+    """day_str이 속한 주의 일요일 (YYYY-MM-DD)"""
+    d = datetime.strptime(day_str, "%Y-%m-%d").date()
+    return (d + timedelta(days=6 - d.weekday())).strftime("%Y-%m-%d")
+
+def get_menu(target_date, fetch=True):
+    """target_date의 {구분: 메뉴} 를 반환 (운영하지 않는 날이면 None)
+
+    주간 식단은 주에 한 번만 파싱해서 menu_cache.json에 두고, 이후에는 dict 조회만 합니다.
+    캐시에 없는 날짜가 주 범위를 넘어섰을 때(주가 바뀜)만 페이지를 다시 받습니다.
+    fetch=False면 절대 요청하지 않고, 캐시가 그 주를 덮지 못하면 LookupError.
+    """
+    day = target_date.strftime("%Y-%m-%d")
+    cache = load_menu_cache()
+    days = cache.get("days", {})
+
+    week_rolled = not days or day > week_end(min(days))
+    revalidate = MENU_REVALIDATE and time.time() - cache.get("checked_at", 0) > MENU_REVALIDATE
+    if week_rolled and not fetch:
+        raise LookupError("식단 캐시 없음")
+    if fetch and (week_rolled or revalidate):
+        cache = refresh_menu_cache(cache)
+        if cache is None:
+            raise LookupError("식단표 없음")
+        days = cache["days"]
+
+    return days.get(day)
+
+def format_menu(menu):
+    if menu is None:
+        return "😴 오늘은 운영하지 않아요."
+    menu_list = [f"🍱 *{category}*\n{content}" for category, content in menu.items()]
+    return "\n\n".join(menu_list) if menu_list else "🍙 등록된 식단 내용이 없습니다."
+
+def get_cafeteria_menu(target_date=None, fetch=True):
+    try:
+        return format_menu(get_menu(target_date or get_korea_today(), fetch))
+    except LookupError:
+        return "❌ 식단표 없음"
     except Exception as e:
         return "⚠️ 식단 정보를 불러오는데 실패했습니다."
 
@@ -92,147 +171,198 @@ def get_cafeteria_menu():
 # [기능 2] 학사일정 (API Reverse Engineering)
 # -----------------------------------------------------------
 def fetch_calendar_data(year, month):
+    """그 달의 일정 조각 HTML (실패하면 None → 예전 캐시를 그대로 사용)"""
     try:
         data = {'sy': str(year), 'sm': str(month)}
-        res = requests.post(CALENDAR_API_URL, data=data, verify=False, timeout=10)
-        return res.text 
-    except:
-        return ""
-
-def get_academic_calendar():
-    today = get_korea_today()
-    
-    target_months = [
-        (today.year, today.month),
-        ((today.replace(day=1) + timedelta(days=32)).year, (today.replace(day=1) + timedelta(days=32)).month),
-        ((today.replace(day=1) + timedelta(days=62)).year, (today.replace(day=1) + timedelta(days=62)).month)
-    ]
+        res = http_client.post(CALENDAR_API_URL, data=data, idempotent=True)
+        res.raise_for_status()
+    except requests.RequestException as e:
+        print(f"⚠️ {year}-{month:02d} 학사일정 요청 실패: {e}")
+        return None
+    metrics.current().count("bytes_downloaded", len(res.content))
+    metrics.current().count("calendar_requests")
+    return res.text
 
-    all_list_items = []
-    for y, m in target_months:
-        html_fragment = fetch_calendar_data(y, m)
-        if html_fragment:
-            soup = BeautifulSoup(html_fragment, 'html.parser')
-            items = soup.find_all("li")
-            all_list_items.extend(items)
-
-    today_events = []
-    upcoming_events = []
-    seen_events = set() 
-
-    for item in all_list_items:
-        date_tag = item.find("strong")
-        title_tag = item.find("p")
+def parse_calendar_fragment(html_fragment):
+    """list5_detail.jsp 조각에서 (날짜 문자열, 제목) 목록을 뽑음"""
+    soup = html_backend.parse(html_fragment)
+    events = []
+    for item in soup.select("li"):
+        date_tag = item.select_one("strong")
+        title_tag = item.select_one("p")
         
         if not date_tag or not title_tag: continue
         
-        raw_date = date_tag.get_text(strip=True)
-        title = title_tag.get_text(strip=True)
-        
-        unique_key = f"{raw_date}_{title}"
-        if unique_key in seen_events: continue
-        seen_events.add(unique_key)
-        
-        dates = re.findall(r'(\d{2}\.\d{2})', raw_date)
-        if not dates: continue
-        
-        current_year = today.year 
-        try:
-            msg_s_mon = int(dates[0].split('.')[0])
-            calc_year = current_year
-            
-            if today.month >= 11 and msg_s_mon <= 2:
-                calc_year += 1
-            elif today.month <= 2 and msg_s_mon >= 11:
-                calc_year -= 1
-            
-            s_date = datetime.strptime(f"{calc_year}.{dates[0]}", "%Y.%m.%d").date()
-            if len(dates) > 1:
-                e_date = datetime.strptime(f"{calc_year}.{dates[1]}", "%Y.%m.%d").date()
-            else:
-                e_date = s_date
-        except:
-            continue
-
-        # 오늘의 일정
-        if s_date <= today <= e_date:
-            if s_date != e_date:
-                end_str = e_date.strftime("%m.%d")
-                end_day = get_day_kor(e_date)
-                today_events.append(f"• {title} ~ {end_str}({end_day})")
-            else:
-                today_events.append(f"• {title}")
-        
-        # 다가오는 일정
-        elif s_date > today:
-            d_day = (s_date - today).days
-            if d_day <= 50:
-                upcoming_events.append({
-                    "date": raw_date,
-                    "title": title,
-                    "d_day": d_day
-                })
+        events.append([date_tag.get_text(strip=True), title_tag.get_text(strip=True)])
+    metrics.current().count("items_scanned", len(events))
+    return events
+
+def load_calendar_cache():
+    if not os.path.exists(CALENDAR_CACHE_FILE):
+        return {}
+    try:
+        with open(CALENDAR_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (ValueError, OSError):
+        return {}
+
+def save_calendar_cache(cache):
+    with open(CALENDAR_CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+def is_cache_fresh(entry, year, month, today):
+    if (year, month) < (today.year, today.month):
+        return True  # 지난 달 일정은 바뀌지 않으므로 계속 사용
+    return time.time() - entry.get("fetched_at", 0) < CALENDAR_CACHE_TTL
+
+def fetch_month_events(year_month):
+    y, m = year_month
+    html_fragment = fetch_calendar_data(y, m)
+    return parse_calendar_fragment(html_fragment) if html_fragment else None
+
+def refresh_calendar_cache(target_months, today, fetch=True):
+    """여러 달의 일정을 캐시에서 꺼내고, 만료된 달만 병렬로 다시 가져옴 (fetch=False면 캐시만) → 캐시 dict"""
+    cache = load_calendar_cache()
+    stale = [(y, m) for y, m in target_months
+             if f"{y}-{m:02d}" not in cache or not is_cache_fresh(cache[f"{y}-{m:02d}"], y, m, today)]
+
+    if stale and fetch:
+        with ThreadPoolExecutor(max_workers=len(stale)) as pool:
+            for (y, m), events in zip(stale, pool.map(metrics.bind(fetch_month_events), stale)):
+                # 요청 실패(None)면 예전 캐시가 있으면 그것이라도 사용
+                if events is not None:
+                    cache[f"{y}-{m:02d}"] = {"fetched_at": time.time(), "events": events}
+        save_calendar_cache(cache)
+    return cache
+
+def calendar_months(today):
+    """지난달(아직 진행 중인 긴 일정) ~ 두 달 뒤"""
+    first = today.replace(day=1)
+    prev = first - timedelta(days=1)
+    months = [(prev.year, prev.month), (today.year, today.month)]
+    for days in (32, 62):
+        d = first + timedelta(days=days)
+        months.append((d.year, d.month))
+    return months
+
+def get_calendar_index(fetch=True):
+    today = get_korea_today()
+    return calendar_index.load_index(refresh_calendar_cache(calendar_months(today), today, fetch))
+
+def format_span(ev):
+    """여러 날 일정이면 " ~ 10.23(금)" """
+    if ev.start == ev.end:
+        return ""
+    return f" ~ {ev.end.strftime('%m.%d')}({get_day_kor(ev.end)})"
+
+def get_academic_calendar(fetch=True):
+    today = get_korea_today()
+    index = get_calendar_index(fetch)
 
     events_text = []
-    
+
+    # 오늘의 일정
+    today_events = [f"• {ev.title}{format_span(ev)}" for ev in index.on(today)]
     if today_events:
         events_text.append(f"🔔 *오늘의 일정*\n" + "\n".join(today_events))
     else:
         # [수정] 멘트 변경 (부드럽게)
         events_text.append(f"🔔 *오늘의 일정*\n 오늘은 예정된 일정이 없어요 🌿")
-    
-    if upcoming_events:
-        upcoming_events.sort(key=lambda x: x['d_day'])
-        min_d_day = upcoming_events[0]['d_day']
-        nearest_events = [e for e in upcoming_events if e['d_day'] == min_d_day]
-        
+
+    # 다가오는 일정 (50일 안에 가장 먼저 시작하는 일정들)
+    nearest_events = [ev for ev in index.next_after(today) if (ev.start - today).days <= 50]
+    if nearest_events:
         temp = ["\n⏳ *다가오는 일정*"]
-        for e in nearest_events:
-            d_day_str = "D-DAY" if e['d_day'] == 0 else f"D-{e['d_day']}"
+        for ev in nearest_events:
+            d_day = (ev.start - today).days
+            d_day_str = "D-DAY" if d_day == 0 else f"D-{d_day}"
             # 괄호 제거된 상태 유지
-            temp.append(f"[{d_day_str}] {e['title']} {e['date']}")
+            temp.append(f"[{d_day_str}] {ev.title} {ev.raw}")
         events_text.append("\n".join(temp))
         
     return "\n".join(events_text) if events_text else "• 예정된 주요 학사일정이 없습니다."
 
+def get_week_calendar(fetch=True):
+    """이번 주(월~일) 일정"""
+    today = get_korea_today()
+    monday = today - timedelta(days=today.weekday())
+    sunday = monday + timedelta(days=6)
+    title = f"🗓 *이번 주 일정* ({monday.strftime('%m.%d')} ~ {sunday.strftime('%m.%d')})"
+
+    lines = []
+    for ev in get_calendar_index(fetch).week(today):
+        lines.append(f"• {ev.start.strftime('%m.%d')}({get_day_kor(ev.start)}){format_span(ev)} {ev.title}")
+    if not lines:
+        lines.append(" 이번 주는 예정된 일정이 없어요 🌿")
+    return title + "\n" + "\n".join(lines)
+
+def build_briefing(today, fetch=True):
+    """모닝 브리핑 본문 (fetch=False면 캐시에 있는 일정/식단만으로 만듦)"""
+    m = metrics.current()
+    # [수정] 요일 한국어로 변경
+    day_kor = get_day_kor(today)
+    today_str = f"{today.strftime('%Y-%m-%d')} ({day_kor})"
+
+    with m.stage("calendar"):
+        calendar_msg = get_academic_calendar(fetch)
+    with m.stage("menu"):
+        menu_msg = get_cafeteria_menu(today, fetch)
+    
+    # [수정] 제목 변경 (광운대 삭제), 날씨 삭제
+    return f"☀️ *모닝 브리핑* {today_str}\n\n" \
+           f"{calendar_msg}\n\n" \
+           f"────────────────\n" \
+           f"🥄 *오늘의 학식*\n\n" \
+           f"{menu_msg}\n" \
+           f" "
+
+def save_briefing(today, text):
+    with open(BRIEFING_FILE, "w", encoding="utf-8") as f:
+        json.dump({"date": today.strftime("%Y-%m-%d"), "sent_at": time.time(), "text": text}, f, ensure_ascii=False)
+
+def load_briefing():
+    if not os.path.exists(BRIEFING_FILE):
+        return {}
+    try:
+        with open(BRIEFING_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (ValueError, OSError):
+        return {}
+
+BRIEFING_BUTTONS = {
+    "inline_keyboard": [
+        [
+            {"text": "📅 전체 학사일정", "url": CALENDAR_PAGE_URL},
+            {"text": "🍙 전체 식단표", "url": MENU_URL}
+        ],
+        [
+            {"text": "📢 전체 공지사항", "url": NOTICE_URL},
+            {"text": "🗣️ 피드백", "url": FEEDBACK_GROUP_URL}
+        ]
+    ]
+}
+
 def run():
     try:
-        today = get_korea_today()
-        # [수정] 요일 한국어로 변경
-        day_kor = get_day_kor(today)
-        today_str = f"{today.strftime('%Y-%m-%d')} ({day_kor})"
-        
-        print(f"🚀 모닝 브리핑 실행 ({today_str})")
-        
-        calendar_msg = get_academic_calendar()
-        menu_msg = get_cafeteria_menu()
-        
-        # [수정] 제목 변경 (광운대 삭제), 날씨 삭제
-        final_msg = f"☀️ *모닝 브리핑* {today_str}\n\n" \
-                    f"{calendar_msg}\n\n" \
-                    f"────────────────\n" \
-                    f"🥄 *오늘의 학식*\n\n" \
-                    f"{menu_msg}\n" \
-                    f" "
-        
-        # [수정] 버튼 이름 변경 (피드백)
-        keyboard = {
-            "inline_keyboard": [
-                [
-                    {"text": "📅 전체 학사일정", "url": CALENDAR_PAGE_URL},
-                    {"text": "🍙 전체 식단표", "url": MENU_URL}
-                ],
-                [
-                    {"text": "📢 전체 공지사항", "url": NOTICE_URL},
-                    {"text": "🗣️ 피드백", "url": FEEDBACK_GROUP_URL}
-                ]
-            ]
-        }
+        with metrics.job("briefing") as m:
+            today = get_korea_today()
+            print(f"🚀 모닝 브리핑 실행 ({today.strftime('%Y-%m-%d')} ({get_day_kor(today)}))")
+            
+            final_msg = build_briefing(today)
+            save_briefing(today, final_msg)
+
+            # 방금 갱신한 캐시로 만든 색인에서 .ics 구독 파일도 같이 갱신 (일정이 그대로면 파일도 그대로)
+            if calendar_index.ICS_FILE and calendar_index.write_ics(get_calendar_index(fetch=False)):
+                print(f"🗓 {calendar_index.ICS_FILE} 갱신")
 
-        # print(final_msg) # 로그 너무 길면 생략 가능
-        print("📨 텔레그램 전송 중...")
-        send_telegram(final_msg, buttons=keyboard)
-        print("✅ 전송 완료")
+            # print(final_msg) # 로그 너무 길면 생략 가능
+            print("📨 텔레그램 전송 중...")
+            with m.stage("send"):
+                failed_before = telegram_queue.failed_count()
+                # [수정] 버튼 이름 변경 (피드백)
+                send_telegram(final_msg, buttons=BRIEFING_BUTTONS)
+                m.set("send_failures", len(telegram_queue.flush(telegram_queue.FLUSH_TIMEOUT)) - failed_before)
+            print("✅ 전송 완료")
 
     except Exception as e:
         error_msg = f"🔥 [비상] 봇 실행 중 오류 발생!\n\n{str(e)}\n\n{traceback.format_exc()}"
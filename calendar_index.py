@@ -0,0 +1,202 @@
+import os
+import re
+import json
+import time
+import hashlib
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+
+# 학사일정 구간 색인: 시작일 순으로 정렬한 일정 목록을 파일로 유지하고
+# "그날의 일정 / 기간 안의 일정 / 다음 일정"을 이진 탐색으로 찾습니다.
+#  - 기간이 겹치는 일정 찾기: 가장 긴 일정 길이(max_span)만큼 앞에서부터 시작한 일정만 보면 됨
+#  - 연도: 일정이 실린 달(calendar_cache.json의 "YYYY-MM")을 기준으로 정함 (오늘 날짜로 추측하지 않음)
+INDEX_FILE = os.environ.get('CALENDAR_INDEX_FILE', 'calendar_index.json')
+# 구독 파일: calendar.yml이 저장소에 커밋하므로 raw.githubusercontent.com/<owner>/<repo>/main/calendar.ics 로 구독
+ICS_FILE = os.environ.get('CALENDAR_ICS_FILE', 'calendar.ics')
+
+ICS_NAME = "광운대학교 학사일정"
+
+class Event:
+    __slots__ = ("start", "end", "title", "raw")
+
+    def __init__(self, start, end, title, raw):
+        self.start = start
+        self.end = end
+        self.title = title
+        self.raw = raw
+
+    @property
+    def uid(self):
+        key = f"{self.start.isoformat()}|{self.end.isoformat()}|{self.title}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16] + "@kw-calendar"
+
+    def to_list(self):
+        return [self.start.isoformat(), self.end.isoformat(), self.title, self.raw]
+
+    @classmethod
+    def from_list(cls, row):
+        return cls(date.fromisoformat(row[0]), date.fromisoformat(row[1]), row[2], row[3])
+
+def parse_event(raw_date, title, year, month):
+    """("10.19(월) ~ 10.23(금)", 제목)을 그 일정이 실린 달(year, month) 기준으로 Event로 변환"""
+    dates = re.findall(r'(\d{2})\.(\d{2})', raw_date)
+    if not dates:
+        return None
+    s_mon, s_day = (int(x) for x in dates[0])
+    # 1월 목록에 실린 12.29 → 작년, 12월 목록에 실린 01.02 → 내년
+    s_year = year
+    if s_mon - month > 6:
+        s_year -= 1
+    elif month - s_mon > 6:
+        s_year += 1
+    try:
+        start = date(s_year, s_mon, s_day)
+        if len(dates) > 1:
+            e_mon, e_day = (int(x) for x in dates[1])
+            end = date(s_year + (1 if e_mon < s_mon else 0), e_mon, e_day)
+        else:
+            end = start
+    except ValueError:
+        return None
+    if end < start:
+        end = start
+    return Event(start, end, title, raw_date)
+
+class CalendarIndex:
+    """시작일로 정렬된 일정 목록 + 가장 긴 일정 길이"""
+
+    def __init__(self, events=(), signature=None):
+        unique = {}
+        for ev in events:
+            # 여러 달에 걸친 일정은 두 달 목록에 모두 실리므로 (시작, 끝, 제목)으로 중복 제거
+            unique.setdefault((ev.start, ev.end, ev.title), ev)
+        self.events = sorted(unique.values(), key=lambda ev: (ev.start, ev.end, ev.title))
+        self.starts = [ev.start for ev in self.events]
+        self.max_span = max(((ev.end - ev.start) for ev in self.events), default=timedelta())
+        self.signature = signature
+
+    def __len__(self):
+        return len(self.events)
+
+    def in_range(self, first, last):
+        """[first, last] 기간과 하루라도 겹치는 일정 (시작일 순)"""
+        lo = bisect_left(self.starts, first - self.max_span)
+        hi = bisect_right(self.starts, last)
+        return [ev for ev in self.events[lo:hi] if ev.end >= first]
+
+    def on(self, day):
+        """day에 진행 중인 일정"""
+        return self.in_range(day, day)
+
+    def next_after(self, day):
+        """day 다음 날 이후 가장 먼저 시작하는 일정들 (같은 날 시작하는 것 모두)"""
+        idx = bisect_right(self.starts, day)
+        if idx == len(self.events):
+            return []
+        first = self.starts[idx]
+        return self.events[idx:bisect_right(self.starts, first)]
+
+    def week(self, day):
+        """day가 속한 주(월~일)와 겹치는 일정"""
+        monday = day - timedelta(days=day.weekday())
+        return self.in_range(monday, monday + timedelta(days=6))
+
+def cache_signature(cache):
+    """달별 캐시가 언제 받아온 것인지로 색인을 다시 만들어야 하는지 판단"""
+    return {month: entry.get("fetched_at") for month, entry in sorted(cache.items())}
+
+def build_index(cache):
+    events = []
+    for month_key, entry in cache.items():
+        year, month = (int(x) for x in month_key.split("-"))
+        for raw_date, title in entry.get("events", []):
+            ev = parse_event(raw_date, title, year, month)
+            if ev:
+                events.append(ev)
+    return CalendarIndex(events, cache_signature(cache))
+
+def load_index(cache):
+    """저장해 둔 색인이 캐시와 같은 버전이면 그대로, 아니면 새로 만들어 저장 (INDEX_FILE=None이면 저장 안 함)"""
+    path = INDEX_FILE
+    signature = cache_signature(cache)
+    if path and os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("signature") == signature:
+                return CalendarIndex([Event.from_list(row) for row in saved["events"]], signature)
+        except (ValueError, OSError, KeyError, TypeError):
+            pass
+
+    index = build_index(cache)
+    if path:
+        # 명령어 봇이 동시에 읽을 수 있으므로 임시 파일에 쓰고 교체
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"signature": signature, "events": [ev.to_list() for ev in index.events]},
+                      f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+    return index
+
+def _ics_text(value):
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def _ics_fold(line):
+    # 한 줄은 75바이트를 넘지 않게 접음 (RFC 5545)
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line
+    parts, current = [], b""
+    for ch in line:
+        encoded = ch.encode("utf-8")
+        if len(current) + len(encoded) > (75 if not parts else 74):
+            parts.append(current.decode("utf-8"))
+            current = b""
+        current += encoded
+    parts.append(current.decode("utf-8"))
+    return "\r\n ".join(parts)
+
+def render_event(ev, stamp):
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{ev.uid}",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART;VALUE=DATE:{ev.start:%Y%m%d}",
+        # 종일 일정의 DTEND는 마지막 날 다음 날
+        f"DTEND;VALUE=DATE:{ev.end + timedelta(days=1):%Y%m%d}",
+        f"SUMMARY:{_ics_text(ev.title)}",
+        "END:VEVENT",
+    ]
+    return "\r\n".join(_ics_fold(line) for line in lines)
+
+def write_ics(index, path=None):
+    """색인에서 .ics를 만들고, 일정이 바뀐 경우에만 파일을 새로 씀 (바뀌었으면 True)
+
+    일정 목록 해시를 파일 머리에 적어 두므로, 캐시를 다시 받아와도 일정이 그대로면 파일도 그대로입니다.
+    """
+    path = path or ICS_FILE
+    digest = hashlib.sha256(json.dumps([ev.to_list() for ev in index.events], ensure_ascii=False)
+                            .encode("utf-8")).hexdigest()
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            if f"X-KW-DIGEST:{digest}" in f.read(400):
+                return False
+
+    # DTSTAMP: 일정을 가져온 시각 (일정이 바뀐 때에만 파일을 쓰므로 구독 앱이 매번 갱신하지 않음)
+    fetched = [t for t in (index.signature or {}).values() if t]
+    stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime(max(fetched) if fetched else time.time()))
+    body = "\r\n".join(render_event(ev, stamp) for ev in index.events)
+    header = "\r\n".join([
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//kw-notice-bot//calendar//KO",
+        "CALSCALE:GREGORIAN",
+        _ics_fold(f"X-WR-CALNAME:{ICS_NAME}"),
+        "X-WR-TIMEZONE:Asia/Seoul",
+        f"X-KW-DIGEST:{digest}",
+    ])
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        f.write(header + "\r\n" + (body + "\r\n" if body else "") + "END:VCALENDAR\r\n")
+    os.replace(tmp_path, path)
+    return True
@@ -0,0 +1,172 @@
+"""명령어 봇: getUpdates 롱 폴링으로 /menu /calendar /today /search 에 답함
+
+답장은 마지막 브리핑(last_briefing.json), 식단/학사일정 캐시, 공지 보관소(archive.db)만
+읽어서 만들고 학교 사이트에는 요청하지 않습니다. 같은 날 같은 명령은 캐시 파일이 바뀌기 전까지
+메모리에 만들어 둔 답을 그대로 쓰므로, 사용자가 몰려도 파일도 다시 읽지 않습니다.
+
+    python command_bot.py
+    python daemon.py --bot      # 데몬과 같이 실행
+"""
+import os
+import html
+import time
+import threading
+from datetime import timedelta
+
+import requests
+
+import archive
+import calendar_bot
+import telegram_queue
+
+API_BASE = telegram_queue.API_BASE
+TOKEN = os.environ.get('TELEGRAM_TOKEN')
+
+# 롱 폴링 대기 시간 (초) — 새 메시지가 오면 바로 반환됨
+POLL_TIMEOUT = int(os.environ.get('BOT_POLL_TIMEOUT', '50'))
+SEARCH_LIMIT = 5
+
+HELP_TEXT = "🤖 *사용할 수 있는 명령어*\n" \
+            "/today - 오늘의 브리핑\n" \
+            "/menu - 오늘의 학식 (/menu 내일)\n" \
+            "/calendar - 학사일정 (/calendar 이번주)\n" \
+            "/search 검색어 - 지난 공지 검색"
+
+_memo = {}
+_memo_lock = threading.Lock()
+
+def _mtime(path):
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+def memoized(name, files, build):
+    """(명령, 오늘 날짜, 캐시 파일 수정 시각)이 같으면 전에 만든 답을 그대로 반환"""
+    key = (name, calendar_bot.get_korea_today(), tuple(_mtime(f) for f in files))
+    with _memo_lock:
+        if key in _memo:
+            return _memo[key]
+    text = build()
+    with _memo_lock:
+        # 오래된 날짜/파일 기준 답은 버림
+        for old in [k for k in _memo if k[0] == name]:
+            del _memo[old]
+        _memo[key] = text
+    return text
+
+def reply_today(args):
+    def build():
+        today = calendar_bot.get_korea_today()
+        briefing = calendar_bot.load_briefing()
+        if briefing.get("date") == today.strftime("%Y-%m-%d"):
+            return briefing["text"]
+        # 오늘 브리핑이 아직 없으면 캐시만으로 새로 만듦
+        return calendar_bot.build_briefing(today, fetch=False)
+    files = (calendar_bot.BRIEFING_FILE, calendar_bot.MENU_CACHE_FILE, calendar_bot.CALENDAR_CACHE_FILE)
+    return memoized("today", files, build), "Markdown"
+
+def reply_menu(args):
+    tomorrow = bool(args) and args[0] in ("내일", "tomorrow")
+
+    def build():
+        day = calendar_bot.get_korea_today() + timedelta(days=1 if tomorrow else 0)
+        title = f"🥄 *{day.strftime('%m.%d')}({calendar_bot.get_day_kor(day)}) 학식*\n\n"
+        return title + calendar_bot.get_cafeteria_menu(day, fetch=False)
+    return memoized("menu-tomorrow" if tomorrow else "menu", (calendar_bot.MENU_CACHE_FILE,), build), "Markdown"
+
+def reply_calendar(args):
+    if args and args[0] in ("이번주", "주간", "week"):
+        return memoized("calendar-week", (calendar_bot.CALENDAR_CACHE_FILE,),
+                        lambda: calendar_bot.get_week_calendar(fetch=False)), "Markdown"
+
+    def build():
+        return "📅 *학사일정*\n\n" + calendar_bot.get_academic_calendar(fetch=False)
+    return memoized("calendar", (calendar_bot.CALENDAR_CACHE_FILE,), build), "Markdown"
+
+def reply_search(args):
+    query = " ".join(args).strip()
+    if not query:
+        return "🔎 /search 뒤에 검색어를 적어주세요. (예: /search 학점교류)", None
+    results = archive.open_archive().search(query, SEARCH_LIMIT)
+    if not results:
+        return f"🔎 '{html.escape(query)}' 검색 결과가 없습니다.", "HTML"
+    lines = [f"🔎 <b>{html.escape(query)}</b> 검색 결과"]
+    for post in results:
+        lines.append(f"\n{post['posted'] or ''} <a href=\"{html.escape(post['link'] or '')}\">{html.escape(post['title'] or '')}</a>")
+    return "\n".join(lines), "HTML"
+
+def reply_help(args):
+    return HELP_TEXT, "Markdown"
+
+COMMANDS = {
+    "/today": reply_today,
+    "/menu": reply_menu,
+    "/calendar": reply_calendar,
+    "/search": reply_search,
+    "/start": reply_help,
+    "/help": reply_help,
+}
+
+def handle(update):
+    message = update.get("message") or {}
+    text = message.get("text") or ""
+    if not text.startswith("/"):
+        return
+    words = text.split()
+    # 그룹에서는 "/menu@봇이름" 형태로 옴
+    command = words[0].split("@")[0].lower()
+    handler = COMMANDS.get(command)
+    if not handler:
+        return
+
+    try:
+        reply, parse_mode = handler(words[1:])
+    except Exception as e:
+        print(f"❌ {command} 처리 실패: {e}")
+        reply, parse_mode = "⚠️ 지금은 답할 수 없어요. 잠시 후 다시 시도해주세요.", None
+
+    payload = {
+        "chat_id": message["chat"]["id"],
+        "text": reply,
+        "reply_to_message_id": message.get("message_id"),
+        "disable_web_page_preview": True,
+    }
+    if parse_mode:
+        payload["parse_mode"] = parse_mode
+    telegram_queue.enqueue(payload)
+
+def get_updates(session, offset):
+    res = session.get(f"{API_BASE}/bot{TOKEN}/getUpdates",
+                      params={"timeout": POLL_TIMEOUT, "offset": offset, "allowed_updates": '["message"]'},
+                      timeout=POLL_TIMEOUT + 10)
+    res.raise_for_status()
+    return res.json().get("result", [])
+
+def serve(should_stop=lambda: False):
+    """롱 폴링 루프 (should_stop()이 True가 되면 다음 폴링 전에 종료)"""
+    if not TOKEN:
+        print("⚠️ TELEGRAM_TOKEN이 없어 명령어 봇을 시작하지 않습니다")
+        return
+    session = requests.Session()
+    offset = None
+    failures = 0
+    print("🤖 명령어 봇 시작")
+    while not should_stop():
+        try:
+            updates = get_updates(session, offset)
+            failures = 0
+        except (requests.RequestException, ValueError) as e:
+            failures += 1
+            wait = min(60, 2 ** failures)
+            print(f"⚠️ getUpdates 실패 ({e}), {wait}초 후 재시도")
+            time.sleep(wait)
+            continue
+        for update in updates:
+            # 다음 요청의 offset으로 처리한 업데이트를 확인 처리함
+            offset = update["update_id"] + 1
+            handle(update)
+
+if __name__ == "__main__":
+    try:
+        serve()
+    except KeyboardInterrupt:
+        pass
+    telegram_queue.flush(telegram_queue.FLUSH_TIMEOUT)
@@ -0,0 +1,115 @@
+"""상주(daemon) 모드: 게시판 모니터링과 모닝 브리핑을 한 프로세스에서 각자 주기대로 실행
+
+GitHub Actions처럼 매번 파이썬을 새로 띄우지 않고, 한 번 올린 프로세스가
+세션(keep-alive 연결), 본 글 기록, 캐시를 메모리에 들고 계속 돕니다.
+상태 파일(seen.log, fetch_cache.json ...)은 실행한 디렉터리에 그대로 저장됩니다.
+
+    python daemon.py                       # 게시판 5분마다, 브리핑 매일 07:30(KST)
+    python daemon.py --scan-minutes 1 --briefing 08:00
+    python daemon.py --bot                 # 명령어 봇(/menu, /today ...)도 같이 실행
+"""
+import os
+import time
+import signal
+import threading
+import argparse
+import traceback
+from datetime import datetime, timedelta
+
+import runner
+import calendar_bot
+import command_bot
+import telegram_queue
+
+SCAN_MINUTES = float(os.environ.get('DAEMON_SCAN_MINUTES', '5'))
+BRIEFING_TIME = os.environ.get('DAEMON_BRIEFING_TIME', '07:30')  # KST
+
+KST_OFFSET = timedelta(hours=9)
+
+_stopping = False
+
+def kst_now():
+    return datetime.utcnow() + KST_OFFSET
+
+def next_briefing_at(hhmm, now=None):
+    """다음 브리핑 시각(KST)을 time.time() 기준 초로 반환"""
+    now = now or kst_now()
+    hour, minute = (int(x) for x in hhmm.split(":"))
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return time.time() + (target - now).total_seconds()
+
+class Job:
+    def __init__(self, name, func, next_run, reschedule):
+        self.name = name
+        self.func = func
+        self.next_run = next_run
+        self.reschedule = reschedule
+
+    def run(self):
+        started = time.monotonic()
+        print(f"⏱️ [{kst_now():%Y-%m-%d %H:%M:%S}] {self.name} 실행")
+        try:
+            self.func()
+        except (SystemExit, Exception):
+            # monitor.run()처럼 exit()로 끝나는 작업이 있어도 데몬은 계속 돌아야 함
+            print(f"❌ {self.name} 실패\n{traceback.format_exc()}")
+        print(f"⏱️ {self.name} 완료 ({time.monotonic() - started:.1f}s)")
+        self.next_run = self.reschedule()
+
+def build_jobs(scan_minutes, briefing_time, run_now=False):
+    scan_seconds = scan_minutes * 60
+    start = time.time()
+
+    def every_scan():
+        return time.time() + scan_seconds
+
+    def every_morning():
+        return next_briefing_at(briefing_time)
+
+    return [
+        # 공지/기숙사/학과 게시판을 한 번에 동시 실행 (runner.py)
+        Job("게시판 모니터링", runner.run, start, every_scan),
+        Job("모닝 브리핑", calendar_bot.run, start if run_now else every_morning(), every_morning),
+    ]
+
+def _stop(signum, frame):
+    global _stopping
+    _stopping = True
+    print("🛑 종료 신호 수신: 진행 중인 작업을 마치고 종료합니다")
+
+def serve(jobs):
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    while not _stopping:
+        job = min(jobs, key=lambda j: j.next_run)
+        wait = job.next_run - time.time()
+        if wait > 0:
+            # 종료 신호에 빨리 반응하도록 최대 1초씩 잠
+            time.sleep(min(wait, 1.0))
+            continue
+        job.run()
+
+    # 큐에 남은 텔레그램 메시지를 다 보내고 종료
+    telegram_queue.flush()
+
+def main():
+    parser = argparse.ArgumentParser(description="공지/기숙사/브리핑 봇 상주 실행")
+    parser.add_argument("--scan-minutes", type=float, default=SCAN_MINUTES, help="공지/기숙사 스캔 주기 (분)")
+    parser.add_argument("--briefing", default=BRIEFING_TIME, help="모닝 브리핑 시각 (KST, HH:MM)")
+    parser.add_argument("--run-now", action="store_true", help="시작하자마자 브리핑도 한 번 실행")
+    parser.add_argument("--bot", action="store_true", help="명령어 봇(getUpdates 롱 폴링)도 같이 실행")
+    args = parser.parse_args()
+
+    if args.bot:
+        # 롱 폴링은 따로 스레드에서 (종료 신호가 오면 진행 중인 폴링이 끝난 뒤 멈춤)
+        threading.Thread(target=command_bot.serve, args=(lambda: _stopping,), name="command-bot", daemon=True).start()
+
+    jobs = build_jobs(args.scan_minutes, args.briefing, args.run_now)
+    print(f"🚀 데몬 시작: 스캔 {args.scan_minutes:g}분 주기, 브리핑 매일 {args.briefing} (KST)")
+    serve(jobs)
+
+if __name__ == "__main__":
+    main()
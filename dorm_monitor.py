@@ -1,11 +1,15 @@
 import os
-import requests
 import json
-import urllib3
 import html
-
-# SSL 인증서 경고 무시
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+import fetch_cache
+import http_client
+import archive
+import state_store
+import subscribers
+import telegram_queue
+import metrics
+import sources
+import traceback
 
 # ▼ 설정 ▼
 API_URL = "https://kw.happydorm.or.kr/bbs/getBbsList.do"
@@ -14,139 +18,329 @@ VIEW_URL = "https://kw.happydorm.or.kr/60/6010.do"
 TOKEN = os.environ.get('TELEGRAM_TOKEN')
 CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID')
 
-def send_telegram(title, date, link):
-    if TOKEN and CHAT_ID:
-        try:
-            safe_title = html.escape(title)
-            msg = f"🏠 <b>[행복기숙사] {safe_title}</b>\n\n" \
-                  f"| 작성일 {date}"
-            
-            url = f"https://api.telegram.org/bot{TOKEN}/sendMessage"
-            keyboard = {
-                "inline_keyboard": [[{"text": "👉 기숙사 공지 보러가기", "url": link}]]
-            }
-            payload = {
-                "chat_id": CHAT_ID,
-                "text": msg,
-                "parse_mode": "HTML", 
-                "reply_markup": json.dumps(keyboard),
-                "disable_notification": True 
-            }
-            requests.post(url, data=payload)
-        except Exception as e:
-            print(f"텔레그램 전송 실패: {e}")
-
-# [핵심 기능] 성공했던 "재귀 탐색" 함수 복구!
-# 키 이름(noticeList 등)을 몰라도, 내용물(seq, subject)이 있으면 무조건 찾아냅니다.
-def find_posts_recursively(data, found_posts):
-    if isinstance(data, dict):
-        # 대소문자 무관하게 키 검사
-        keys = {k.lower(): k for k in data.keys()}
-        seq_key = keys.get('seq')
-        subj_key = keys.get('subject') or keys.get('title') or keys.get('nttsj')
-        
-        # 게시글 형태(ID와 제목이 있음)라면 확보!
-        if seq_key and subj_key:
-            found_posts.append({
-                'id': str(data[seq_key]),
-                'title': data[subj_key],
-                'date': data.get('regdate') or data.get('REGDATE') or '날짜 미상'
+# 커서 페이징: 마지막으로 처리한 가장 큰 seq(커서)까지만 읽음
+#  - 평소에는 STEADY_ROWS개짜리 작은 페이지 하나만 요청
+#  - 작은 페이지가 전부 커서보다 새 글이면 (사이에 글이 더 있음) 필요한 만큼 rows를 키우고 다음 페이지로 진행
+BASELINE_ROWS = 20
+STEADY_ROWS = int(os.environ.get('DORM_STEADY_ROWS', '5'))
+MAX_ROWS = int(os.environ.get('DORM_MAX_ROWS', '100'))
+MAX_PAGES = int(os.environ.get('DORM_MAX_PAGES', '10'))
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124 Safari/537.36",
+    "Origin": "https://kw.happydorm.or.kr",
+    "Referer": "https://kw.happydorm.or.kr/60/6010.do"
+}
+
+def build_message(title, date, link):
+    safe_title = html.escape(title)
+    msg = f"🏠 <b>[행복기숙사] {safe_title}</b>\n\n" \
+          f"| 작성일 {date}"
+    
+    keyboard = {
+        "inline_keyboard": [[{"text": "👉 기숙사 공지 보러가기", "url": link}]]
+    }
+    return {
+        "text": msg,
+        "parse_mode": "HTML", 
+        "reply_markup": json.dumps(keyboard),
+        "disable_notification": True 
+    }
+
+def send_digest(posts, chat_id=None):
+    """새 글이 많을 때 목록 하나로 묶어서 보냄"""
+    chat_id = chat_id or CHAT_ID
+    if TOKEN and chat_id:
+        lines = [f"🏠 <b>[행복기숙사] 새 공지 {len(posts)}건</b>", ""]
+        for post in posts:
+            lines.append(f"• {html.escape(post['title'])} ({post['date']})")
+        lines.append(f"\n👉 <a href=\"{VIEW_URL}\">기숙사 공지 보러가기</a>")
+
+        for text in telegram_queue.chunk_lines(lines):
+            telegram_queue.enqueue({
+                "chat_id": chat_id,
+                "text": text,
+                "parse_mode": "HTML",
+                "disable_web_page_preview": True,
+                "disable_notification": True
             })
-            return 
 
-        # 게시글이 아니면 더 깊이 탐색
-        for v in data.values():
-            find_posts_recursively(v, found_posts)
-            
-    elif isinstance(data, list):
-        for item in data:
-            find_posts_recursively(item, found_posts)
+def notify(posts):
+    """구독 조건에 맞는 채팅방마다 보냄 (메시지 본문은 글마다 한 번만 만듦)"""
+    if not posts or not TOKEN:
+        return
+    messages = {}
+    for chat_id, chat_posts in subscribers.fan_out("dorm", posts):
+        if telegram_queue.DIGEST_MIN and len(chat_posts) >= telegram_queue.DIGEST_MIN:
+            send_digest(chat_posts, chat_id)
+            continue
+        for post in chat_posts:
+            if post['id'] not in messages:
+                messages[post['id']] = build_message(post['title'], post['date'], post['link'])
+            telegram_queue.enqueue(dict(messages[post['id']], chat_id=chat_id))
 
-def run():
-    print(f"🚀 행복기숙사 공지 스캔 시작...")
+# [핵심 기능] 게시글 목록 위치 학습
+# 키 이름(noticeList 등)을 몰라도, 내용물(seq, subject)이 있으면 찾아내는 건 그대로 유지하되
+# 한 번 찾은 위치(JSON 경로)와 키 이름을 기억해 두고 다음부터는 그 자리만 바로 읽습니다.
+# 기억한 자리에서 아무것도 안 나오면 (응답 구조가 바뀌면) 전체 탐색으로 다시 학습합니다.
+# 학습할 때 비어 있던 목록(예: 고정 공지 noticeList)에 나중에 글이 생기면, 기억한 목록의 부모 dict에서
+# 다른 값들의 첫 항목만 싸게 확인해서 다시 학습합니다.
+PATHS_CACHE_KEY = "dorm_paths"
+
+_learned = None
+
+def post_keys(data):
+    """게시글 형태(ID와 제목이 있음)의 dict면 실제 키 이름들을, 아니면 None을 반환"""
+    # 대소문자 무관하게 키 검사
+    keys = {k.lower(): k for k in data.keys()}
+    seq_key = keys.get('seq')
+    subj_key = keys.get('subject') or keys.get('title') or keys.get('nttsj')
+    if seq_key and subj_key:
+        return seq_key, subj_key, keys.get('regdate')
+    return None
+
+def make_post(data, seq_key, subj_key, date_key):
+    return {
+        'id': str(data[seq_key]),
+        'title': data[subj_key],
+        'date': (data.get(date_key) if date_key else None) or '날짜 미상'
+    }
+
+def discover_posts(data):
+    """응답 전체를 (재귀 없이 스택으로) 훑어서 게시글이 있는 위치별로 묶어 반환
+
+    반환값: [(spec, posts), ...]  spec = 경로/키 이름 (다음 실행에서 바로 읽는 데 사용)
+    """
+    groups = {}
+    stack = [((), data)]
+    while stack:
+        path, node = stack.pop()
+        if isinstance(node, dict):
+            keys = post_keys(node)
+            if keys:
+                # 목록 안의 글이면 목록 자체의 경로를 기억
+                in_list = bool(path) and isinstance(path[-1], int)
+                container = path[:-1] if in_list else path
+                group = groups.setdefault((container, keys, in_list), [])
+                group.append(make_post(node, *keys))
+                continue
+            # 원래 순서대로 방문하도록 거꾸로 쌓음
+            for k in reversed(list(node)):
+                stack.append((path + (k,), node[k]))
+        elif isinstance(node, list):
+            for i in range(len(node) - 1, -1, -1):
+                stack.append((path + (i,), node[i]))
+
+    result = []
+    for (container, (seq_key, subj_key, date_key), in_list), posts in groups.items():
+        spec = {"path": list(container), "list": in_list, "seq": seq_key, "subject": subj_key, "date": date_key}
+        result.append((spec, posts))
+    return result
+
+def node_at(data, path):
+    node = data
+    for step in path:
+        node = node[step]
+    return node
+
+def has_unlearned_posts(data, specs):
+    """기억한 목록과 같은 부모 dict 안에 기억하지 않은 게시글 목록이 생겼는지 (각 값의 첫 항목만 확인)"""
+    learned = {tuple(spec["path"]) for spec in specs}
+    for parent_path in {tuple(spec["path"][:-1]) for spec in specs if spec["path"]}:
+        parent = node_at(data, parent_path)
+        if not isinstance(parent, dict):
+            continue
+        for key, value in parent.items():
+            if parent_path + (key,) in learned:
+                continue
+            first = (value[0] if value else None) if isinstance(value, list) else value
+            if isinstance(first, dict) and post_keys(first):
+                return True
+    return False
+
+def read_learned(data, specs):
+    """기억해 둔 경로에서 바로 게시글을 읽음 (구조가 달라졌거나 새 목록이 생기면 빈 목록 → 다시 학습)"""
+    result = []
+    try:
+        if has_unlearned_posts(data, specs):
+            return []
+        for spec in specs:
+            node = node_at(data, spec["path"])
+            items = node if spec["list"] else [node]
+            posts = [make_post(item, spec["seq"], spec["subject"], spec["date"])
+                     for item in items
+                     if isinstance(item, dict) and spec["seq"] in item and spec["subject"] in item]
+            result.append((spec, posts))
+    except (KeyError, IndexError, TypeError):
+        return []
+    return result if any(posts for _, posts in result) else []
+
+def extract_posts(data):
+    """게시글 위치별 묶음 [(spec, posts), ...] 을 반환 (학습한 경로 우선, 실패하면 전체 탐색)"""
+    global _learned
+    if _learned is None:
+        _learned = fetch_cache.load(PATHS_CACHE_KEY).get("specs", [])
+
+    groups = read_learned(data, _learned) if _learned else []
+    if groups:
+        return groups
 
-    # [설정] 일반 공지는 20개만 요청 (고정 공지는 서버가 주는 대로 다 받음)
+    groups = discover_posts(data)
+    specs = [spec for spec, _ in groups]
+    if specs and specs != _learned:
+        print(f"🧭 게시글 위치 학습: {', '.join('/'.join(map(str, s['path'])) or '(root)' for s in specs)}")
+        _learned = specs
+        fetch_cache.save(PATHS_CACHE_KEY, {"specs": specs})
+    return groups
+
+def list_hash(groups):
+    """목록의 (seq, 제목, 작성일)만 해시 — 조회수처럼 볼 때마다 바뀌는 값은 빼고 비교"""
+    items = sorted((post["id"], post["title"], post["date"]) for _, posts in groups for post in posts)
+    return fetch_cache.content_hash(json.dumps(items, ensure_ascii=False))
+
+def posted_date(value):
+    # "2026.10.01 09:00:00" 같은 값도 정렬되도록 YYYY-MM-DD로 맞춤
+    if not value or value == '날짜 미상':
+        return None
+    return str(value)[:10].replace(".", "-")
+
+def seq_of(post):
+    try:
+        return int(post['id'])
+    except (TypeError, ValueError):
+        return None
+
+def latest_seq(seen):
+    """지금까지 처리한 가장 큰 seq (커서). 본 글이 없으면 None"""
+    seqs = [int(key) for key in seen.index if key.isdigit()]
+    return max(seqs) if seqs else None
+
+def gap_top(groups, rows, cursor):
+    """요청한 rows만큼 꽉 찬 목록이 전부 커서보다 새 글이면, 그 목록의 가장 큰 seq를 반환 (틈이 없으면 None)"""
+    for _, posts in groups:
+        seqs = [s for s in map(seq_of, posts) if s is not None]
+        if len(seqs) >= rows and min(seqs) > cursor:
+            return max(seqs)
+    return None
+
+def request_page(page, rows, extra_headers=None):
     data = {
-        'cPage': '1',
-        'rows': '20', 
+        'cPage': str(page),
+        'rows': str(rows), 
         'bbs_locgbn': 'KW',
         'bbs_id': 'notice',
         'sType': '', 
         'sWord': ''
     }
+    headers = dict(HEADERS, **(extra_headers or {}))
+    # 목록 조회라서 POST지만 다시 보내도 안전함 → 재시도 허용
+    res = http_client.post(API_URL, data=data, headers=headers, idempotent=True)
+    # 재시도 후에도 5xx/429면 http_client가 그 응답을 그대로 돌려줌 → JSON으로 풀지 않고 실패 처리
+    res.raise_for_status()
+    return res
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124 Safari/537.36",
-        "Origin": "https://kw.happydorm.or.kr",
-        "Referer": "https://kw.happydorm.or.kr/60/6010.do"
-    }
+def page_forward(groups, rows, cursor):
+    """첫 페이지와 커서 사이에 틈이 있으면 커서에 닿을 때까지 더 가져와서 묶음 목록을 늘려 반환"""
+    all_groups = list(groups)
+    page = 1
+    for _ in range(MAX_PAGES - 1):
+        top = gap_top(groups, rows, cursor)
+        if top is None:
+            break
+        if page == 1 and rows < MAX_ROWS:
+            # 작은 페이지로는 부족: 커서까지의 seq 차이만큼 rows를 키워서 1페이지를 다시 요청
+            rows = min(MAX_ROWS, max(rows * 2, top - cursor + 1))
+        else:
+            page += 1
+        print(f"📚 커서({cursor})까지 틈이 있어 추가 요청: cPage={page}, rows={rows}")
+        res = request_page(page, rows)
+        # 1페이지는 BoardSource.run이 세므로 추가로 가져온 페이지만 셈
+        metrics.current().count("bytes_downloaded", len(res.content))
+        metrics.current().count("pages_fetched")
+        groups = extract_posts(res.json())
+        all_groups.extend(groups)
+    return all_groups
 
-    try:
-        res = requests.post(API_URL, data=data, headers=headers, verify=False, timeout=10)
-        
+class DormSource(sources.BoardSource):
+    """행복기숙사 공지 (JSON API): 커서보다 새 글만 알리고, 틈이 있으면 페이지를 넘겨 더 가져옴"""
+
+    def __init__(self):
+        self.name = "dorm"
+        self.label = "기숙사"
+        self.cursor = None
+        self.page_rows = BASELINE_ROWS
+        self.posts = []
+
+    @property
+    def url(self):
+        return API_URL
+
+    def open_seen(self):
+        return state_store.open_store("dorm", legacy_file="dorm_data.txt")
+
+    def fetch(self, cache, seen):
+        self.cursor = latest_seq(seen)
+        # [설정] 첫 실행은 20개로 기준점을 잡고, 이후에는 작은 페이지만 (고정 공지는 서버가 주는 대로 다 받음)
+        self.page_rows = STEADY_ROWS if self.cursor is not None else BASELINE_ROWS
+        return request_page(1, self.page_rows, fetch_cache.conditional_headers(cache))
+
+    def parse(self, response):
         try:
-            result = res.json()
+            result = response.json()
         except ValueError:
-            print(f"❌ 응답이 JSON이 아닙니다!")
-            return
+            raise ValueError("응답이 JSON이 아닙니다")
+        # 기억해 둔 위치(없으면 전체 탐색)에서 모든 게시글 긁어오기
+        return extract_posts(result)
+
+    def content_hash(self, groups):
+        # 응답 바이트가 아니라 뽑아낸 목록으로 비교 (조회수 hit는 매번 바뀌므로)
+        return list_hash(groups)
 
-        # 1. 성공했던 방식(재귀 탐색)으로 모든 게시글 긁어오기
-        all_found_posts = []
-        find_posts_recursively(result, all_found_posts)
-        
+    def extract(self, groups, seen):
+        # 커서까지 틈이 있으면 (글이 몰린 경우) 페이지를 넘기며 더 가져옴
+        if self.cursor is not None:
+            groups = page_forward(groups, self.page_rows, self.cursor)
+
+        all_found_posts = [post for _, posts in groups for post in posts]
+        metrics.current().set("items_scanned", len(all_found_posts))
         print(f"🔍 발견된 전체 데이터: {len(all_found_posts)}개 (고정+일반 포함)")
 
-        # 2. 데이터 정제 및 리스트 생성
-        current_posts = []
-        for post in all_found_posts:
-            if not post['id']: continue
-            
-            # 링크 추가
-            post['link'] = VIEW_URL
-            current_posts.append(post)
-
-        # 3. 중복 제거 (ID 기준)
-        # 딕셔너리 컴프리헨션을 이용해 중복 ID 제거
-        unique_posts_dict = {p['id']: p for p in current_posts}
-        unique_posts = list(unique_posts_dict.values())
-
-        # 4. [핵심] ID 내림차순 정렬 (최신글이 맨 위로)
+        # 링크를 붙이고 ID 기준으로 중복 제거
+        unique_posts = list({post['id']: dict(post, link=VIEW_URL) for post in all_found_posts if post['id']}.values())
+
+        # ID 내림차순 정렬 (최신글이 맨 위로)
         # 8340(고정)이 8335(일반)보다 숫자가 크므로, 정렬하면 자연스럽게 맨 위로 옵니다.
         unique_posts.sort(key=lambda x: int(x['id']), reverse=True)
+        if unique_posts:
+            print(f"📝 스캔 범위: 상단 {unique_posts[0]['id']} ... 하단 {unique_posts[-1]['id']} (총 {len(unique_posts)}개)")
+        self.posts = unique_posts
+        return unique_posts
+
+    def should_notify(self, post):
+        # 커서보다 오래된 글(새로 고정된 옛 글 등)은 기록만 하고 알리지 않음
+        return self.cursor is None or int(post["id"]) > self.cursor
 
-        # 5. [설정 적용] 상위 20개만 자르기
-        final_posts = unique_posts[:20]
-
-        if final_posts:
-            print(f"📝 저장 범위: 상단 {final_posts[0]['id']} ... 하단 {final_posts[-1]['id']} (총 {len(final_posts)}개)")
-        
-        old_posts = []
-        if os.path.exists("dorm_data.txt"):
-            with open("dorm_data.txt", "r", encoding="utf-8") as f:
-                old_posts = [line.strip() for line in f.readlines() if line.strip()]
-
-        save_data = []
-        
-        # 알림 전송 및 저장
-        for post in final_posts:
-            save_data.append(post["id"])
-            if not old_posts: continue
-            
-            if post["id"] not in old_posts:
-                print(f"🚀 새 기숙사 공지: {post['title']} (ID: {post['id']})")
-                send_telegram(post['title'], post['date'], post['link'])
-
-        if not old_posts:
-             print("🚀 첫 실행: 기준점 잡기 완료")
-
-        with open("dorm_data.txt", "w", encoding="utf-8") as f:
-            for pid in save_data:
-                f.write(pid + "\n")
-        
-        print("💾 dorm_data.txt 업데이트 완료")
+    def sync(self, m, new_posts):
+        # 읽어온 글은 모두 검색 색인에 쌓아둠 (바뀐 게 없으면 DB에 쓰지 않음)
+        with m.stage("index"):
+            archive.open_archive().index_posts("dorm", [
+                {"key": post["id"], "title": post["title"], "category": archive.title_category(post["title"]),
+                 "department": "행복기숙사", "posted": posted_date(post["date"]),
+                 "link": post["link"]}
+                for post in self.posts
+            ])
 
+    def notify(self, posts):
+        notify(posts)
+
+def run():
+    print(f"🚀 행복기숙사 공지 스캔 시작...")
+
+    try:
+        DormSource().run()
     except Exception as e:
         print(f"❌ 오류 발생: {e}")
+        traceback.print_exc()
 
 if __name__ == "__main__":
     run()
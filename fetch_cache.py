@@ -0,0 +1,71 @@
+import os
+import json
+import re
+import hashlib
+import threading
+
+# 모니터별 마지막 응답 정보(ETag / Last-Modified / 목록 영역 해시)를 저장하는 파일
+CACHE_FILE = "fetch_cache.json"
+
+def load(name):
+    """name(모니터 이름)에 해당하는 마지막 응답 정보를 반환 (없으면 빈 dict)"""
+    if not os.path.exists(CACHE_FILE):
+        return {}
+    try:
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f).get(name, {})
+    except (ValueError, OSError):
+        return {}
+
+# 여러 소스가 동시에 저장할 때(runner.py) 서로의 항목을 덮어쓰지 않도록 읽기-수정-쓰기를 묶음
+_lock = threading.Lock()
+
+def save(name, entry):
+    with _lock:
+        _save(name, entry)
+
+def _save(name, entry):
+    cache = {}
+    if os.path.exists(CACHE_FILE):
+        try:
+            with open(CACHE_FILE, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (ValueError, OSError):
+            cache = {}
+
+    if cache.get(name) == entry:
+        return
+
+    cache[name] = entry
+    with open(CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+def conditional_headers(entry):
+    """저장된 ETag / Last-Modified로 조건부 요청 헤더를 만듦"""
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+def make_entry(response, content_hash):
+    entry = {"hash": content_hash}
+    if response.headers.get("ETag"):
+        entry["etag"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        entry["last_modified"] = response.headers["Last-Modified"]
+    return entry
+
+def normalize_html(fragment):
+    """태그를 걷어내고 공백을 합친 뒤, 매번 바뀌는 조회수는 지움 (파싱 없이 정규식만 사용)"""
+    text = re.sub(r"<[^>]+>", " ", fragment)
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"조회\S*\s*[\d,]+", "", text)
+    return text.strip()
+
+def content_hash(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
@@ -0,0 +1,90 @@
+import os
+
+# 사용할 HTML 파서 (빠른 순서). HTML_PARSER 환경변수로 강제 지정 가능
+#  - selectolax : lexbor(C) 기반 CSS 셀렉터 파서
+#  - lxml       : BeautifulSoup + lxml(C) 트리 빌더
+#  - html.parser: BeautifulSoup 기본 파서 (순수 파이썬, 항상 사용 가능)
+BACKENDS = ("selectolax", "lxml", "html.parser")
+
+# BeautifulSoup의 get_text()처럼 본문 텍스트에서 제외할 태그
+_SKIP_TEXT_TAGS = {"script", "style", "template"}
+_SKIP_TEXT_SELECTOR = ", ".join(sorted(_SKIP_TEXT_TAGS))
+
+_default_backend = None
+
+def is_available(name):
+    try:
+        if name == "selectolax":
+            import selectolax.lexbor  # noqa: F401
+        else:
+            import bs4  # noqa: F401
+            if name == "lxml":
+                import lxml  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def available_backends():
+    return [name for name in BACKENDS if is_available(name)]
+
+def default_backend():
+    """처음 파싱할 때 정함. 쓸 수 있는 첫 번째 파서까지만 import (selectolax가 있으면 bs4는 불러오지 않음)"""
+    global _default_backend
+    if _default_backend is None:
+        forced = os.environ.get("HTML_PARSER")
+        if forced in BACKENDS and is_available(forced):
+            _default_backend = forced
+        else:
+            _default_backend = next((name for name in BACKENDS if is_available(name)), "html.parser")
+    return _default_backend
+
+def parse(markup, backend=None):
+    """markup을 파싱해서 select / select_one / get_text / get 을 지원하는 노드를 반환
+
+    어떤 백엔드를 쓰든 추출 코드는 이 네 가지 메서드만 사용하므로 그대로 공유됩니다.
+    """
+    backend = backend or default_backend()
+    if backend == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+        return LexborNode(LexborHTMLParser(markup).root)
+
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(markup, backend)
+
+class LexborNode:
+    """selectolax 노드를 BeautifulSoup Tag와 같은 모양으로 감싼 어댑터"""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        self._node = node
+
+    def select(self, selector):
+        return [LexborNode(n) for n in self._node.css(selector)]
+
+    def select_one(self, selector):
+        node = self._node.css_first(selector)
+        return LexborNode(node) if node is not None else None
+
+    def get(self, attr, default=None):
+        value = self._node.attributes.get(attr)
+        return default if value is None else value
+
+    def get_text(self, separator="", strip=False):
+        # BeautifulSoup과 동일하게: 스크립트/주석 제외, strip=True면 빈 조각은 버림
+        if not separator and not strip and self._node.css_first(_SKIP_TEXT_SELECTOR) is None:
+            # 제외할 태그가 없으면 lexbor의 text()와 결과가 같음 (주석도 제외됨) — 파이썬으로 순회하지 않음
+            return self._node.text()
+        parts = []
+        for node in self._node.traverse(include_text=True):
+            if node.tag != "-text":
+                continue
+            if node.parent is not None and node.parent.tag in _SKIP_TEXT_TAGS:
+                continue
+            text = node.text_content or ""
+            if strip:
+                text = text.strip()
+                if not text:
+                    continue
+            parts.append(text)
+        return separator.join(parts)
@@ -0,0 +1,216 @@
+import os
+import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urlsplit
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+# SSL 인증서 경고 무시 (학교 사이트 인증서 체인 문제로 verify=False 사용)
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# ▼ 설정 ▼
+# 연결 / 응답 대기 시간 (초). 모든 모듈이 같은 값을 씀
+CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', '5'))
+READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', '20'))
+
+# 조회성 요청(GET, 또는 idempotent=True로 표시한 POST)만 재시도
+RETRIES = int(os.environ.get('HTTP_RETRIES', '2'))
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+# 요청 하나(재시도 포함)에 쓰는 최대 시간 — 이걸 넘길 재시도는 하지 않아서 실행 시간 꼬리가 짧아짐
+DEADLINE = float(os.environ.get('HTTP_DEADLINE', '45'))
+
+# 같은 host가 연속으로 이만큼 실패하면 COOLDOWN 동안 바로 실패 처리 (서버가 죽었을 때 계속 두드리지 않음)
+BREAKER_THRESHOLD = int(os.environ.get('HTTP_BREAKER_THRESHOLD', '5'))
+BREAKER_COOLDOWN = float(os.environ.get('HTTP_BREAKER_COOLDOWN', '60'))
+
+# 헤지 요청: 첫 요청이 이 host의 최근 응답 시간 p(HEDGE_PERCENTILE)를 넘기면 같은 요청을 하나 더 보내고
+# 먼저 온 응답을 사용 (0이면 사용 안 함). 최근 기록이 HEDGE_MIN_SAMPLES개 이상일 때만 동작
+HEDGE_PERCENTILE = float(os.environ.get('HTTP_HEDGE_PERCENTILE', '0'))
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', '10'))
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+class CircuitOpen(requests.ConnectionError):
+    """차단기가 열린 host로 요청 (requests.RequestException으로 같이 처리됨)"""
+
+class HostState:
+    """host 하나의 연결 풀(세션), 연속 실패 수, 최근 응답 시간"""
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def check(self, host):
+        with self.lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < BREAKER_COOLDOWN:
+                raise CircuitOpen(f"{host}: 연속 {self.failures}회 실패로 잠시 요청 중단")
+            # 쉬는 시간이 지나면 한 번 시도해 봄 (성공하면 닫히고, 실패하면 다시 열림)
+            self.opened_at = None
+
+    def succeeded(self, elapsed):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.latencies.append(elapsed)
+
+    def failed(self, host):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= BREAKER_THRESHOLD and self.opened_at is None:
+                self.opened_at = time.monotonic()
+                print(f"⛔ {host}: 연속 {self.failures}회 실패, {BREAKER_COOLDOWN:.0f}초 동안 요청 중단")
+                metrics.current().count("http_breaker_open")
+
+    def hedge_delay(self):
+        with self.lock:
+            if not HEDGE_PERCENTILE or len(self.latencies) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * HEDGE_PERCENTILE / 100))]
+
+class Client:
+    """모든 모듈이 같이 쓰는 HTTP 클라이언트 (host별 연결 풀 / 재시도 / 차단기 / 헤지 요청)"""
+
+    def __init__(self):
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+
+    def host_state(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = HostState()
+            return state
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method, url, idempotent=None, retries=RETRIES, **kwargs):
+        """응답을 반환 (5xx/429는 재시도 후에도 실패하면 마지막 응답을 그대로 반환)
+
+        네트워크 오류는 재시도 후 requests.RequestException으로 올라갑니다.
+        """
+        if idempotent is None:
+            idempotent = method in ("GET", "HEAD")
+        kwargs.setdefault("timeout", (CONNECT_TIMEOUT, READ_TIMEOUT))
+        kwargs.setdefault("verify", False)
+
+        host = urlsplit(url).netloc
+        state = self.host_state(host)
+        attempts = 1 + (retries if idempotent else 0)
+        started = time.monotonic()
+
+        for attempt in range(attempts):
+            state.check(host)
+            try:
+                res = self._send(state, method, url, idempotent, kwargs)
+            except requests.RequestException as e:
+                state.failed(host)
+                if not self._retry_after(attempt, attempts, started):
+                    raise
+                print(f"🔁 {host} 재시도 ({attempt + 1}/{attempts - 1}): {e}")
+                continue
+
+            if res.status_code not in RETRY_STATUS:
+                return res
+            state.failed(host)
+            if not self._retry_after(attempt, attempts, started):
+                return res
+            print(f"🔁 {host} 재시도 ({attempt + 1}/{attempts - 1}): HTTP {res.status_code}")
+
+    def _retry_after(self, attempt, attempts, started):
+        """재시도할 수 있으면 백오프만큼 쉬고 True (남은 시간이 모자라면 False)"""
+        if attempt + 1 >= attempts:
+            return False
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * (0.5 + random.random() / 2)
+        if time.monotonic() - started + delay + CONNECT_TIMEOUT > DEADLINE:
+            return False
+        metrics.current().count("http_retries")
+        time.sleep(delay)
+        return True
+
+    def _send(self, state, method, url, idempotent, kwargs):
+        delay = state.hedge_delay() if idempotent else None
+        if delay is None:
+            return self._timed(state, method, url, kwargs)
+
+        first = self._hedge_pool.submit(self._timed, state, method, url, kwargs)
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+
+        # 첫 요청이 평소보다 느림 → 같은 요청을 하나 더 보내고 먼저 성공한 쪽을 사용
+        metrics.current().count("http_hedged")
+        second = self._hedge_pool.submit(self._timed, state, method, url, kwargs)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    res = future.result()
+                except requests.RequestException as e:
+                    error = e
+                    continue
+                for other in pending:
+                    other.add_done_callback(_close_response)
+                return res
+        raise error
+
+    def _timed(self, state, method, url, kwargs):
+        start = time.monotonic()
+        res = state.session.request(method, url, **kwargs)
+        if res.status_code not in RETRY_STATUS:
+            state.succeeded(time.monotonic() - start)
+        return res
+
+def _close_response(future):
+    # 헤지 요청에서 늦게 도착한 쪽 응답은 버림
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """프로세스 전체에서 하나의 클라이언트를 공유 (host별 연결/차단기 상태도 공유)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = Client()
+        return _client
+
+def get(url, **kwargs):
+    return get_client().get(url, **kwargs)
+
+def post(url, **kwargs):
+    return get_client().post(url, **kwargs)
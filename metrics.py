@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import threading
+import traceback
+from contextlib import contextmanager
+
+# 실행 기록: 한 번 실행할 때마다 JSON 한 줄 추가
+METRICS_LOG = os.environ.get('METRICS_LOG', 'metrics.jsonl')
+# node_exporter textfile collector용 파일 (설정했을 때만 기록)
+METRICS_PROM = os.environ.get('METRICS_PROM')
+
+PREFIX = "kwbot"
+
+class JobMetrics:
+    """한 번의 run()에서 단계별 시간과 카운터를 모음 (여러 스레드에서 동시에 count 해도 안전)"""
+
+    def __init__(self, job):
+        self.job = job
+        self.started = time.time()
+        self.stages = {}
+        self.counters = {}
+        self.status = "ok"
+        self.error = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def set(self, name, value):
+        with self._lock:
+            self.counters[name] = value
+
+    def record(self):
+        return {
+            "job": self.job,
+            "timestamp": round(self.started, 3),
+            "status": self.status,
+            "error": self.error,
+            "duration_s": round(time.time() - self.started, 4),
+            "stages_s": {k: round(v, 4) for k, v in self.stages.items()},
+            "counters": dict(self.counters),
+        }
+
+class _NullMetrics:
+    """측정 중이 아닐 때(벤치마크, 단독 함수 호출) 쓰는 아무 일도 안 하는 객체"""
+
+    @contextmanager
+    def stage(self, name):
+        yield
+
+    def count(self, name, n=1):
+        pass
+
+    def set(self, name, value):
+        pass
+
+_NULL = _NullMetrics()
+# 여러 작업이 동시에 돌 수 있으므로(runner.py) 실행 중인 작업은 스레드마다 따로 기억
+_local = threading.local()
+
+def current():
+    """지금 실행 중인 작업의 JobMetrics (없으면 아무 일도 안 하는 객체)"""
+    return getattr(_local, "job", None) or _NULL
+
+def bind(func):
+    """스레드 풀에서 실행할 함수가 지금 작업의 메트릭에 기록하도록 감쌈"""
+    m = getattr(_local, "job", None)
+
+    def wrapper(*args, **kwargs):
+        previous = getattr(_local, "job", None)
+        _local.job = m
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.job = previous
+    return wrapper
+
+@contextmanager
+def job(name):
+    """with metrics.job("notice") as m: ... 로 감싸면 끝날 때 JSON lines / Prometheus 파일에 기록
+
+    예외는 기록한 뒤 그대로 다시 던집니다 (원래 traceback 포함).
+    """
+    m = JobMetrics(name)
+    previous = getattr(_local, "job", None)
+    _local.job = m
+    try:
+        yield m
+    except BaseException as e:
+        m.status = "error"
+        m.error = "".join(traceback.format_exception_only(type(e), e)).strip()
+        raise
+    finally:
+        _local.job = previous
+        _check_yield(m)
+        write(m)
+
+def _check_yield(m):
+    # 받아온 데이터는 있는데 뽑힌 글이 0개면 사이트 구조가 바뀌었을 가능성이 큼
+    if m.status == "ok" and m.counters.get("bytes_downloaded") and m.counters.get("items_scanned") == 0:
+        print(f"⚠️ [{m.job}] 응답은 받았지만 추출된 항목이 0개입니다 (페이지 구조 변경 의심)")
+
+_write_lock = threading.Lock()
+
+def write(m):
+    rec = m.record()
+    try:
+        with _write_lock:
+            with open(METRICS_LOG, "a", encoding="utf-8") as f:
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            if METRICS_PROM:
+                write_prometheus(rec, METRICS_PROM)
+    except OSError as e:
+        print(f"메트릭 기록 실패: {e}")
+
+def _prom_lines(rec):
+    label = f'job="{rec["job"]}"'
+    lines = [
+        f'{PREFIX}_job_up{{{label}}} {1 if rec["status"] == "ok" else 0}',
+        f'{PREFIX}_job_duration_seconds{{{label}}} {rec["duration_s"]}',
+        f'{PREFIX}_job_last_run_timestamp_seconds{{{label}}} {rec["timestamp"]}',
+    ]
+    if rec["status"] == "ok":
+        lines.append(f'{PREFIX}_job_last_success_timestamp_seconds{{{label}}} {rec["timestamp"]}')
+    for stage, seconds in sorted(rec["stages_s"].items()):
+        lines.append(f'{PREFIX}_job_stage_seconds{{{label},stage="{stage}"}} {seconds}')
+    for name, value in sorted(rec["counters"].items()):
+        if isinstance(value, (int, float)):
+            lines.append(f'{PREFIX}_job_{name}{{{label}}} {value}')
+    return lines
+
+def write_prometheus(rec, path):
+    """다른 작업의 줄은 남겨두고 이 작업의 줄만 교체 (임시 파일 → rename 으로 원자적 교체)
+
+    실패한 실행이면 이전의 마지막 성공 시각은 그대로 남겨서 "오래 성공 못 함" 알림에 쓸 수 있게 합니다.
+    """
+    marker = f'job="{rec["job"]}"'
+    keep_success = rec["status"] != "ok"
+    kept = []
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if not line or line.startswith("#"):
+                    continue
+                if marker not in line or (keep_success and "_last_success_" in line):
+                    kept.append(line)
+    lines = kept + _prom_lines(rec)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(sorted(lines)) + "\n")
+    os.replace(tmp_path, path)
@@ -1,171 +1,489 @@
 import os
 import requests
 import json
-from bs4 import BeautifulSoup
-import urllib3
 import re
 import html # [NEW] HTML 특수문자 처리를 위해 추가
-
-# SSL 인증서 경고 무시
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from concurrent.futures import ThreadPoolExecutor
+import fetch_cache
+import http_client
+import html_backend
+import state_store
+import archive
+import subscribers
+import telegram_queue
+import metrics
+import sources
+import traceback
 
 # ▼ 설정 ▼
-TARGET_URL = "https://www.kw.ac.kr/ko/life/notice.jsp"
+SITE_URL = "https://www.kw.ac.kr"
+TARGET_URL = f"{SITE_URL}/ko/life/notice.jsp"
 TOKEN = os.environ.get('TELEGRAM_TOKEN')
 CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID')
 
+# 다중 페이지 크롤링 (등록 기간처럼 글이 몰릴 때 2페이지 이후로 밀려난 글까지 확인)
+MAX_PAGES = int(os.environ.get('NOTICE_MAX_PAGES', '5'))
+MAX_WORKERS = int(os.environ.get('NOTICE_MAX_WORKERS', '4'))
+
+# 새 글/수정된 글의 상세 페이지(본문, 첨부파일)를 동시에 가져오는 수
+DETAIL_WORKERS = int(os.environ.get('NOTICE_DETAIL_WORKERS', '4'))
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+# 모든 요청은 http_client를 거침 (host별 keep-alive 연결 풀 / 재시도 / 차단기를 다른 모듈과 공유)
+
 def get_emoji(title):
-    if "장학" in title or "대출" in title: return "💰" 
-    elif "학사" in title or "수업" in title or "복학" in title: return "📅" 
-    elif "행사" in title or "축제" in title or "특강" in title: return "🎉" 
-    elif "채용" in title or "모집" in title or "인턴" in title: return "👔" 
-    elif "국제" in title or "교환" in title: return "✈️" 
-    elif "봉사" in title: return "❤️" 
-    elif "대회" in title or "공모" in title: return "🏆" 
-    else: return "📢" 
-
-def send_telegram(title, link, info):
-    if TOKEN and CHAT_ID:
-        try:
-            icon = get_emoji(title)
-            
-            # 1. [머리말] 뒤에 줄바꿈 추가 (Regex)
-            # 예: "[외부] 제목" -> "[외부]\n제목"
-            temp_title = re.sub(r'(?<=\])\s*', '\n', title).strip()
-            
-            # 2. [NEW] HTML 이스케이프 처리
-            # 제목에 <, >, & 같은 문자가 있으면 HTML 태그로 오해해서 에러가 날 수 있으므로 변환합니다.
-            safe_title = html.escape(temp_title)
-
-            # 3. [NEW] HTML 태그로 볼드체(굵게) 적용 (<b>...</b>)
-            msg = f"{icon} <b>{safe_title}</b>\n" \
-                  f"\n" \
-                  f"{info}"
-            
-            url = f"https://api.telegram.org/bot{TOKEN}/sendMessage"
-            
-            keyboard = {
-                "inline_keyboard": [
-                    [
-                        {"text": "👉 공지 내용 보러가기", "url": link}
-                    ]
-                ]
-            }
-
-            payload = {
-                "chat_id": CHAT_ID,
-                "text": msg,
-                "parse_mode": "HTML", # [핵심] Markdown 대신 HTML 모드 사용!
-                "reply_markup": json.dumps(keyboard),
-                "disable_notification": True 
-            }
-            requests.post(url, data=payload)
-        except Exception as e:
-            print(f"텔레그램 전송 실패: {e}")
+    # 분류표는 구독 라우팅과 같이 쓰도록 subscribers.CATEGORIES에 있음
+    return subscribers.category_icon(title)
 
-def run():
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124 Safari/537.36"
+def build_message(title, link, info):
+    """채팅방과 상관없는 메시지 본문 (구독자가 많아도 글마다 한 번만 만듦)"""
+    icon = get_emoji(title)
+    
+    # 1. [머리말] 뒤에 줄바꿈 추가 (Regex)
+    # 예: "[외부] 제목" -> "[외부]\n제목"
+    temp_title = re.sub(r'(?<=\])\s*', '\n', title).strip()
+    
+    # 2. [NEW] HTML 이스케이프 처리
+    # 제목에 <, >, & 같은 문자가 있으면 HTML 태그로 오해해서 에러가 날 수 있으므로 변환합니다.
+    safe_title = html.escape(temp_title)
+
+    # 3. [NEW] HTML 태그로 볼드체(굵게) 적용 (<b>...</b>)
+    msg = f"{icon} <b>{safe_title}</b>\n" \
+          f"\n" \
+          f"{info}"
+    
+    keyboard = {
+        "inline_keyboard": [
+            [
+                {"text": "👉 공지 내용 보러가기", "url": link}
+            ]
+        ]
     }
 
-    try:
-        print(f"접속 시도: {TARGET_URL}")
-        response = requests.get(TARGET_URL, headers=headers, verify=False, timeout=30)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        items = soup.select(".board-list-box ul li")[:50]
-        current_new_posts = []
+    return {
+        "text": msg,
+        "parse_mode": "HTML", # [핵심] Markdown 대신 HTML 모드 사용!
+        "reply_markup": json.dumps(keyboard),
+        "disable_notification": True 
+    }
 
-        print(f"🔍 스캔 중... ({len(items)}개)")
+def send_digest(posts, chat_id=None):
+    """새 글이 많을 때 한 건씩 보내지 않고 목록 하나로 묶어서 보냄"""
+    chat_id = chat_id or CHAT_ID
+    if TOKEN and chat_id:
+        lines = [f"📬 <b>새 공지 {len(posts)}건</b>", ""]
+        for post in posts:
+            lines.append(f"{get_emoji(post['title'])} <a href=\"{html.escape(post['link'])}\">{html.escape(post['title'])}</a>")
 
-        for item in items:
-            if "신규게시글" not in item.get_text():
-                continue
+        for text in telegram_queue.chunk_lines(lines):
+            telegram_queue.enqueue({
+                "chat_id": chat_id,
+                "text": text,
+                "parse_mode": "HTML",
+                "disable_web_page_preview": True,
+                "disable_notification": True
+            })
 
-            a_tag = item.select_one("div.board-text > a")
-            info_tag = item.select_one("p.info") 
+def notify(posts):
+    """새 글을 구독 조건에 맞는 채팅방마다 보냄 (채팅방끼리는 전송 큐에서 병렬로 나감)"""
+    if not posts or not TOKEN:
+        return
+    messages = {}
+    for chat_id, chat_posts in subscribers.fan_out("notice", posts):
+        if telegram_queue.DIGEST_MIN and len(chat_posts) >= telegram_queue.DIGEST_MIN:
+            send_digest(chat_posts, chat_id)
+            continue
+        for post in chat_posts:
+            if post['id'] not in messages:
+                messages[post['id']] = build_message(post['title'], post['link'], post['info'])
+            telegram_queue.enqueue(dict(messages[post['id']], chat_id=chat_id))
 
-            if info_tag and "교수지원팀" in info_tag.get_text():
-                continue
+def fetch_page(page):
+    params = {"tpage": page} if page > 1 else None
+    response = http_client.get(TARGET_URL, params=params, headers=HEADERS)
+    metrics.current().count("bytes_downloaded", len(response.content))
+    metrics.current().count("pages_fetched")
+    # 재시도 후에도 5xx/429면 http_client가 그 응답을 그대로 돌려주므로 여기서 실패 처리
+    response.raise_for_status()
+    return response.text
+
+def list_region(page_html):
+    """공지 목록(.board-list-box) 부분만 잘라서 정규화 (BeautifulSoup 없이 문자열로 처리)"""
+    start = page_html.find("board-list-box")
+    if start == -1:
+        return fetch_cache.normalize_html(page_html)
+    end = page_html.find("</ul>", start)
+    return fetch_cache.normalize_html(page_html[start:end if end != -1 else None])
+
+def normalize_link(link):
+    # 2페이지 이후 글도 링크의 tpage 값은 1로 맞춰서, 글이 페이지를 넘나들어도 같은 fingerprint가 되게 함
+    return re.sub(r'tpage=\d+', 'tpage=1', link)
+
+def parse_duid(link):
+    """공지 링크에서 DUID(글 번호)를 정수로 뽑음 (없으면 None)"""
+    found = re.search(r'DUID=(\d+)', link or "")
+    return int(found.group(1)) if found else None
+
+def scan_cutoff(duids, seen):
+    """목록 순서대로 볼 때, 이 위치부터는 이미 본 글과 그보다 오래된 글만 남는 첫 index
+
+    고정 공지는 목록 맨 위에 옛날 DUID로 섞여 있으므로 "이미 본 글"을 만났다고 바로 멈추지 않고,
+    그 뒤에 더 최신 DUID가 하나도 없을 때만 멈춥니다 (뒤에서부터 최댓값을 누적해서 O(n)).
+    """
+    if not seen:
+        return len(duids)
+    cutoff = len(duids)
+    later_max = -1
+    for idx in range(len(duids) - 1, -1, -1):
+        duid = duids[idx]
+        if duid is None:
+            # DUID를 모르는 글 앞에서는 멈출 수 없음
+            later_max = float("inf")
+            continue
+        if duid > later_max and str(duid) in seen:
+            cutoff = idx
+        later_max = max(later_max, duid)
+    return cutoff
 
-            if a_tag:
-                raw_title = " ".join(a_tag.get_text().split())
-                clean_title = raw_title.replace("신규게시글", "").replace("Attachment", "").strip()
-                
-                link = a_tag.get('href')
-                full_link = f"https://www.kw.ac.kr{link}" if link else TARGET_URL
-                
-                meta_info = ""
-                if info_tag:
-                    raw_text = info_tag.get_text("|", strip=True)
-                    parts = raw_text.split("|")
-                    clean_parts = []
+def title_of(a_tag):
+    raw_title = " ".join(a_tag.get_text().split())
+    return raw_title.replace("신규게시글", "").replace("Attachment", "").strip()
+
+MODIFIED_RE = re.compile(r'수정일\s*(\d{4}[-.]\d{2}[-.]\d{2})')
+
+def modified_of(item):
+    """수정일만 (row_meta보다 훨씬 쌈 — 조기 종료 아래쪽 줄의 수정 감지용)"""
+    info_tag = item.select_one("p.info")
+    found = MODIFIED_RE.search(info_tag.get_text()) if info_tag else None
+    return found.group(1) if found else None
+
+def row_meta(item):
+    """목록 한 줄의 작성일/수정일/작성 부서 — 메시지 형식과 상관없이 수정 감지와 검색 색인에 사용"""
+    meta = {"posted": None, "modified": None, "department": None}
+    info_tag = item.select_one("p.info")
+    if not info_tag:
+        return meta
+    text = info_tag.get_text(" ", strip=True)
+    posted = re.search(r'작성일\s*(\d{4}[-.]\d{2}[-.]\d{2})', text)
+    if posted:
+        meta["posted"] = posted.group(1).replace(".", "-")
+    modified = MODIFIED_RE.search(text)
+    if modified:
+        meta["modified"] = modified.group(1)
+    # 숫자도 항목 이름도 아닌 마지막 조각이 작성 부서 (예: "학사지원팀")
+    parts = [p.strip() for p in info_tag.get_text("|", strip=True).split("|")]
+    names = [p for p in parts if p and not any(c.isdigit() for c in p)
+             and not any(label in p for label in ("작성일", "수정일", "조회", "번호"))]
+    if names:
+        meta["department"] = names[-1]
+    return meta
+
+def extract_post(item, a_tag, duid, site=None):
+    """목록 한 줄에서 제목/링크/메타 정보를 뽑음 (비용이 큰 부분이라 필요한 글에만 실행)"""
+    if "신규게시글" not in item.get_text():
+        return None
+
+    info_tag = item.select_one("p.info") 
+
+    if info_tag and "교수지원팀" in info_tag.get_text():
+        return None
+
+    clean_title = title_of(a_tag)
+    
+    link = a_tag.get('href')
+    site = site or SITE_URL
+    full_link = normalize_link(f"{site}{link}") if link else TARGET_URL
+    
+    meta_info = ""
+    if info_tag:
+        raw_text = info_tag.get_text("|", strip=True)
+        parts = raw_text.split("|")
+        clean_parts = []
+        skip_next = False
+        for part in parts:
+            p = part.strip()
+            if not p: continue
+            if "수정일" in p:
+                skip_next = True
+                continue
+            if skip_next:
+                if any(char.isdigit() for char in p):
+                    skip_next = False
+                    continue
+                else:
                     skip_next = False
-                    for part in parts:
-                        p = part.strip()
-                        if not p: continue
-                        if "수정일" in p:
-                            skip_next = True
-                            continue
-                        if skip_next:
-                            if any(char.isdigit() for char in p):
-                                skip_next = False
-                                continue
-                            else:
-                                skip_next = False
-                        if "조회" in p: continue
-                        clean_parts.append(p)
-                    
-                    final_parts = []
-                    idx = 0
-                    while idx < len(clean_parts):
-                        current = clean_parts[idx]
-                        if "작성일" in current and idx + 1 < len(clean_parts):
-                            final_parts.append(f"{current} {clean_parts[idx+1]}")
-                            idx += 2
-                        else:
-                            final_parts.append(current)
-                            idx += 1
-                    
-                    if final_parts:
-                        meta_info = "| " + " | ".join(final_parts)
-
-                fingerprint = f"{clean_title}|{full_link}"
-                
-                current_new_posts.append({
-                    "id": fingerprint,
-                    "title": clean_title,
-                    "link": full_link,
-                    "info": meta_info
-                })
-
-        old_posts = []
-        if os.path.exists("data.txt"):
-            with open("data.txt", "r", encoding="utf-8") as f:
-                old_posts = [line.strip() for line in f.readlines() if line.strip()]
-
-        save_data = []
-        for post in current_new_posts:
-            save_data.append(post["id"])
-            
-            if not old_posts:
+            if "조회" in p: continue
+            clean_parts.append(p)
+        
+        final_parts = []
+        idx = 0
+        while idx < len(clean_parts):
+            current = clean_parts[idx]
+            if "작성일" in current and idx + 1 < len(clean_parts):
+                final_parts.append(f"{current} {clean_parts[idx+1]}")
+                idx += 2
+            else:
+                final_parts.append(current)
+                idx += 1
+        
+        if final_parts:
+            meta_info = "| " + " | ".join(final_parts)
+
+    # 글 번호(DUID)를 키로 사용 → 제목이 수정돼도 같은 글로 인식
+    post_id = str(duid) if duid is not None else f"{clean_title}|{full_link}"
+    
+    return {
+        "id": post_id,
+        "duid": duid,
+        "title": clean_title,
+        "link": full_link,
+        "info": meta_info
+    }
+
+def parse_posts(page_html, seen=None, site=None, rows=None):
+    """목록 페이지에서 새 글 후보를 뽑음. (posts, 이미 본 글까지 도달했는지) 를 반환
+
+    1단계로 각 줄의 링크에서 DUID만 싸게 읽고, 이미 본 글에 도달한 위치 이후로는
+    제목 정리/메타 정보 정리 같은 비싼 추출을 하지 않습니다.
+    rows(dict)를 넘기면 목록의 모든 줄에 대해 {DUID: 제목/링크/수정일}을 채웁니다 (수정 감지용).
+    이미 본 글 아래쪽 줄은 DUID/링크/수정일만 읽고 제목은 None으로 둡니다.
+    그 줄의 링크 태그는 "a_tag"에 남겨 두므로, 보관소에 제목이 없으면 fill_titles()로 채웁니다.
+    """
+    # SITE_URL은 실행할 때 읽음 (테스트에서 바꿔 끼울 수 있도록)
+    site = site or SITE_URL
+    soup = html_backend.parse(page_html)
+
+    # 고정 공지가 위에 붙으면 한 페이지가 50줄을 넘으므로 자르지 않음 (잘린 줄의 글은 다음 페이지에도 없음)
+    items = soup.select(".board-list-box ul li")
+    metrics.current().count("items_scanned", len(items))
+
+    a_tags = [item.select_one("div.board-text > a") for item in items]
+    duids = [parse_duid(a_tag.get('href')) if a_tag else None for a_tag in a_tags]
+    cutoff = scan_cutoff(duids, seen)
+    metrics.current().count("items_extracted", cutoff)
+
+    if rows is not None:
+        for idx, (item, a_tag, duid) in enumerate(zip(items, a_tags, duids)):
+            if not a_tag or duid is None or duid in rows:
                 continue
-            
-            if post["id"] not in old_posts:
-                print(f"🚀 새 공지: {post['title']}")
-                send_telegram(post['title'], post['link'], post['info'])
+            link = normalize_link(f"{site}{a_tag.get('href')}")
+            if idx < cutoff:
+                rows[duid] = dict(row_meta(item), duid=duid, title=title_of(a_tag), link=link)
+            else:
+                rows[duid] = {"duid": duid, "title": None, "link": link, "modified": modified_of(item), "a_tag": a_tag}
 
-        if not old_posts:
-             print("🚀 첫 실행: 기준점 잡기 완료")
+    posts = []
+    for item, a_tag, duid in zip(items[:cutoff], a_tags, duids):
+        if not a_tag:
+            continue
+        post = extract_post(item, a_tag, duid, site)
+        if post:
+            posts.append(post)
 
-        with open("data.txt", "w", encoding="utf-8") as f:
-            for pid in save_data:
-                f.write(pid + "\n")
-        
-        print("💾 data.txt 업데이트 완료")
+    return posts, cutoff < len(items)
+
+def fetch_and_parse(page, seen=None, rows=None):
+    return parse_posts(fetch_page(page), seen, rows=rows)
+
+def crawl(seen, first_page_html, rows=None):
+    """1페이지부터 읽고, 새 글이 남아있는 동안만 다음 페이지들을 병렬로 가져옴"""
+    collected, reached_known = parse_posts(first_page_html, seen, rows=rows)
+    print(f"🔍 1페이지 스캔 완료 ({len(collected)}개)")
+
+    # 첫 실행이거나 1페이지에서 이미 본 글까지 도달했으면 요청 1번으로 끝
+    if seen.is_empty() or reached_known or all(p["id"] in seen for p in collected):
+        return collected
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        page = 2
+        while page <= MAX_PAGES:
+            batch = list(range(page, min(page + MAX_WORKERS, MAX_PAGES + 1)))
+            # map은 페이지 순서대로 결과를 돌려주므로, 앞 페이지부터 조기 종료 여부를 판단할 수 있음
+            results = pool.map(metrics.bind(lambda p: fetch_and_parse(p, seen, rows)), batch)
+            for p, (posts, reached_known) in zip(batch, results):
+                print(f"🔍 {p}페이지 스캔 완료 ({len(posts)}개)")
+                collected.extend(posts)
+                if reached_known or all(post["id"] in seen for post in posts):
+                    return collected
+            page += len(batch)
+
+    return collected
+
+def parse_detail(page_html):
+    """상세 페이지에서 (본문 텍스트, 첨부파일 이름 목록)을 뽑음"""
+    soup = html_backend.parse(page_html)
+    body_tag = None
+    for selector in ("div.board-view-box div.contents", "div.board-view-box", "div.view-con", "div.contents"):
+        body_tag = soup.select_one(selector)
+        if body_tag:
+            break
+    body = " ".join(body_tag.get_text(" ", strip=True).split()) if body_tag else ""
+    attachments = []
+    for a_tag in soup.select('a[href*="download"], a[href*="fileDown"]'):
+        name = " ".join(a_tag.get_text().split())
+        if name and name not in attachments:
+            attachments.append(name)
+    return body, attachments
+
+def fetch_detail(link):
+    try:
+        response = http_client.get(link, headers=HEADERS)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"⚠️ 상세 페이지 실패 ({link}): {e}")
+        return None
+    metrics.current().count("bytes_downloaded", len(response.content))
+    metrics.current().count("details_fetched")
+    return parse_detail(response.text)
+
+def fill_titles(rows, titled):
+    """제목을 안 읽은 아래쪽 줄 중 제목이 저장돼 있지 않은 글(titled에 없는 글)만 제목을 읽음
+
+    첫 배포(seen.log만 있고 보관소는 빈 경우)나 캐시에서 archive.db가 지워진 경우에
+    제목 없는 글이 보관소/색인에 들어가지 않도록 합니다. 평소에는 전부 titled에 있어서 비용이 없음.
+    """
+    for duid, row in rows.items():
+        a_tag = row.pop("a_tag", None)
+        if row["title"] is None and duid not in titled and a_tag is not None:
+            row["title"] = title_of(a_tag)
+
+def detail_hash(body, attachments):
+    return fetch_cache.content_hash(body + "\n" + "\n".join(attachments))
+
+def sync_details(rows, new_posts):
+    """목록의 글을 색인하고, 새 글과 수정일이 바뀐 글만 상세 페이지를 병렬로 가져와 보관한 뒤
+    내용이 바뀐 글 목록을 반환
+
+    보관소에 처음 보이는 옛 글은 본문을 가져오지 않고 수정일만 기억해 둡니다.
+    지난 실행에서 상세 페이지를 못 가져온 글(PENDING)은 목록에 없어도 다시 가져옵니다.
+    """
+    store = archive.open_archive()
+    known = store.lookup(rows.keys())
+    fill_titles(rows, {duid for duid, prev in known.items() if prev["title"]})
+    # 목록에 보인 글은 검색 색인에도 쌓아둠 (바뀐 게 없으면 DB에 쓰지 않음, 제목을 안 읽은 아래쪽 줄은 이미 색인됨)
+    store.index_posts("notice", [
+        dict(row, key=duid, category=archive.title_category(row["title"])) for duid, row in rows.items() if row["title"]
+    ])
+    new_ids = {post["duid"] for post in new_posts if post.get("duid") is not None}
+
+    targets = {}
+    for duid, row in rows.items():
+        prev = known.get(duid)
+        if duid in new_ids or (prev and prev["modified"] != row["modified"]):
+            targets[duid] = dict(row, title=row["title"] or prev["title"]) if prev else row
+        elif prev is None or (prev["title"] is None and row["title"]):
+            store.remember(duid, row["title"], row["link"], row["modified"])
+    for item in store.pending():
+        if item["duid"] not in targets:
+            known[item["duid"]] = item
+            targets[item["duid"]] = dict(item, modified=None)
+
+    changed = []
+    if not targets:
+        return changed
+
+    targets = list(targets.values())
+    with ThreadPoolExecutor(max_workers=DETAIL_WORKERS) as pool:
+        details = list(pool.map(metrics.bind(fetch_detail), [row["link"] for row in targets]))
+
+    for row, detail in zip(targets, details):
+        if detail is None:
+            # PENDING으로 표시해 두면 목록이 그대로여도 다음 실행에서 다시 가져옴 (새 글도 보관소에 남음)
+            store.mark_pending(row["duid"], row["title"], row["link"])
+            continue
+        body, attachments = detail
+        digest = detail_hash(body, attachments)
+        store.store(row["duid"], row["title"], row["link"], row["modified"], body, attachments, digest)
+        store.index_body("notice", row["duid"], body)
+        prev = known.get(row["duid"])
+        if prev and prev["content_hash"] and prev["content_hash"] != digest:
+            print(f"✏️ 공지 수정: {row['title']}")
+            changed.append(row)
+    return changed
 
+def notify_changes(rows):
+    """이미 알린 공지의 내용이 바뀌었을 때 (마감일 변경 등) 다시 알림"""
+    if not rows or not TOKEN:
+        return
+    # 예전 실행에서 제목 없이 저장된 글도 알림은 보냄 (구독 키워드 비교에 None이 들어가지 않도록)
+    posts = [dict(row, id=str(row["duid"]), title=row["title"] or f"공지 {row['duid']}") for row in rows]
+    for chat_id, chat_posts in subscribers.fan_out("notice", posts):
+        for post in chat_posts:
+            info = f"| 수정일 {post['modified']}" if post["modified"] else ""
+            payload = build_message(f"[수정됨] {post['title']}", post['link'], info)
+            telegram_queue.enqueue(dict(payload, chat_id=chat_id))
+
+def retry_pending(m):
+    """빠른 경로에서도 지난번에 못 가져온 상세 페이지는 다시 시도 (목록이 바뀔 때까지 기다리지 않음)"""
+    with m.stage("details"):
+        changed = sync_details({}, [])
+    m.set("changed_items", len(changed))
+    notify_changes(changed)
+
+def legacy_key(key):
+    # 예전 "제목|링크" 키를 DUID 키로 변환
+    duid = parse_duid(key)
+    return str(duid) if duid is not None else key
+
+def needs_rekey(seen):
+    """DUID로 바꿀 수 있는 예전 키가 남아있는지 (DUID 없는 링크의 "제목|링크" 키는 그대로 두므로 제외)"""
+    return any(not key.isdigit() and legacy_key(key) != key for key in seen.index)
+
+class NoticeSource(sources.KwBoardSource):
+    """광운대 공지사항: 학과 게시판과 같은 흐름에 여러 페이지 크롤링, DUID 키 이전, 본문 수정 감지를 더함"""
+
+    def __init__(self):
+        self.name = "notice"
+        self.label = "공지"
+        self.rows = {}
+        self.changed = []
+
+    # 주소는 실행할 때 모듈 값에서 읽음 (부하 테스트가 가짜 서버로 바꿔 끼움)
+    @property
+    def url(self):
+        return TARGET_URL
+
+    @property
+    def site(self):
+        return SITE_URL
+
+    def open_seen(self):
+        seen = state_store.open_store("notice", legacy_file="data.txt")
+        if needs_rekey(seen):
+            seen.rekey(legacy_key)
+        return seen
+
+    def fetch(self, cache, seen):
+        print(f"접속 시도: {TARGET_URL}")
+        return super().fetch(cache, seen)
+
+    def unchanged(self, m):
+        retry_pending(m)
+
+    def extract(self, doc, seen):
+        # 1페이지에서 이미 본 글까지 닿지 않았으면 다음 페이지들도 가져옴 (검색 색인은 sync에서)
+        self.rows = {}
+        return crawl(seen, doc, self.rows)
+
+    def sync(self, m, new_posts):
+        # 새 글 + 수정일이 바뀐 글의 본문/첨부를 가져와 보관 (내용이 실제로 바뀐 글은 다시 알림)
+        with m.stage("details"):
+            self.changed = sync_details(self.rows, new_posts)
+        m.set("changed_items", len(self.changed))
+
+    def notify(self, posts):
+        notify(posts)
+        notify_changes(self.changed)
+
+def run():
+    try:
+        NoticeSource().run()
     except Exception as e:
         print(f"❌ 오류 발생: {e}")
+        traceback.print_exc()
         exit(1)
 
 if __name__ == "__main__":
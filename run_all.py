@@ -0,0 +1,95 @@
+"""공지/기숙사/학과 게시판/모닝 브리핑 중 원하는 작업을 한 프로세스에서 같이 실행
+
+작업마다 파이썬을 따로 띄우지 않고, 고른 작업에 필요한 모듈만 import합니다.
+기숙사(JSON API)만 돌리면 공지 모듈과 HTML 파서(selectolax/bs4)는 불러오지 않습니다.
+파이썬 시작과 모듈 import에 걸린 시간을 같이 출력합니다.
+
+    python run_all.py                       # 전체
+    python run_all.py notice dorm boards    # 게시판만 (30분 모니터링)
+    python run_all.py briefing              # 모닝 브리핑만
+"""
+import time
+
+# 인터프리터가 여기까지 오는 데 쓴 CPU 시간 (다른 import보다 먼저 잼)
+STARTUP_CPU = time.process_time()
+
+import sys
+import argparse
+import importlib
+
+# 작업 이름 → 그 작업이 쓰는 모듈
+JOBS = {
+    "notice": ("monitor",),
+    "dorm": ("dorm_monitor",),
+    "boards": ("monitor",),   # sources.json의 학과 게시판 (공지와 같은 목록 추출 사용)
+    "briefing": ("calendar_bot",),
+}
+
+# 실행 뒤 어떤 외부 라이브러리가 실제로 불러와졌는지 보고
+HEAVY_MODULES = ("requests", "urllib3", "bs4", "lxml", "selectolax")
+
+def timed_import(name, timings):
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    timings.append((name, time.perf_counter() - started))
+    return module
+
+def select_sources(sources, jobs):
+    """고른 작업의 소스 목록 (브리핑도 runner가 같이 돌리도록 소스로 감쌈)"""
+    # 공지/기숙사는 고른 것만 import (기숙사만 돌리면 monitor/HTML 파서를 불러오지 않음)
+    selected = sources.builtin_sources([job for job in jobs if job in ("notice", "dorm")])
+    if "boards" in jobs:
+        selected += sources.board_sources(taken=[name for name, _, _ in sources.BUILTIN_SOURCES])
+    if "briefing" in jobs:
+        selected.append(sources.ModuleSource("briefing", "calendar_bot", "CALENDAR_API_URL"))
+    return selected
+
+def run(jobs):
+    """jobs를 동시에 실행하고 실패한 작업 이름 목록을 반환"""
+    timings = []
+    # requests는 모든 작업이 쓰므로 따로 재서 보여줌 (HTML 파서는 처음 파싱할 때 import됨)
+    timed_import("requests", timings)
+    asyncio = timed_import("asyncio", timings)
+    runner = timed_import("runner", timings)
+    sources = timed_import("sources", timings)
+    metrics = timed_import("metrics", timings)
+    telegram_queue = timed_import("telegram_queue", timings)
+    for name in dict.fromkeys(module for job in jobs for module in JOBS[job]):
+        timed_import(name, timings)
+
+    import_ms = sum(elapsed for _, elapsed in timings) * 1000
+    print(f"⏱️ 시작: 파이썬 {STARTUP_CPU * 1000:.0f}ms (CPU), import {import_ms:.0f}ms "
+          f"({', '.join(f'{name} {elapsed * 1000:.0f}ms' for name, elapsed in timings)})")
+
+    with metrics.job("run_all") as m:
+        m.set("startup_cpu_ms", round(STARTUP_CPU * 1000, 1))
+        m.set("import_ms", round(import_ms, 1))
+
+        source_list = select_sources(sources, jobs)
+        print(f"🚀 작업 {', '.join(jobs)} → 소스 {len(source_list)}개 동시 실행")
+        results = asyncio.run(runner.run_all(source_list))
+        telegram_queue.flush(telegram_queue.FLUSH_TIMEOUT)
+
+        failed = [name for name, ok in results.items() if not ok]
+        m.set("failed_sources", len(failed))
+
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    print(f"📦 불러온 라이브러리: {', '.join(loaded) or '없음'}")
+    if failed:
+        print(f"❌ 실패한 작업: {', '.join(failed)}")
+    return failed
+
+def main():
+    parser = argparse.ArgumentParser(description="공지/기숙사/학과 게시판/모닝 브리핑을 한 프로세스에서 실행")
+    parser.add_argument("jobs", nargs="*", metavar="job", help=f"실행할 작업 ({', '.join(JOBS)}), 생략하면 전체")
+    args = parser.parse_args()
+
+    unknown = [job for job in args.jobs if job not in JOBS]
+    if unknown:
+        parser.error(f"알 수 없는 작업: {', '.join(unknown)} (가능: {', '.join(JOBS)})")
+    jobs = list(dict.fromkeys(args.jobs)) or list(JOBS)
+    if run(jobs):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
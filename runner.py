@@ -0,0 +1,75 @@
+"""모든 게시판(기본 공지/기숙사 + sources.json의 학과 게시판)을 한 이벤트 루프에서 동시에 실행
+
+소스마다 run()은 (requests가 블로킹이라) 스레드 풀에서 돌고, 같은 host에는
+PER_HOST개까지만 동시에 요청합니다. 한 소스가 실패해도 나머지는 그대로 끝까지 돕니다.
+
+    python runner.py                 # 전체
+    python runner.py --only notice ce
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import sources
+import telegram_queue
+
+# 같은 서버(host)에 동시에 돌리는 소스 수 (학교 서버에 부담을 주지 않도록)
+PER_HOST = int(os.environ.get('RUNNER_PER_HOST', '2'))
+# 전체 동시 실행 수 (스레드 풀 크기)
+MAX_WORKERS = int(os.environ.get('RUNNER_MAX_WORKERS', '16'))
+
+async def run_source(source, limit, pool):
+    loop = asyncio.get_running_loop()
+    async with limit:
+        started = time.monotonic()
+        try:
+            await loop.run_in_executor(pool, source.run)
+            ok = True
+        except (SystemExit, Exception):
+            # monitor.run()처럼 exit()로 끝나는 소스가 있어도 다른 소스는 계속 돌아야 함
+            print(f"❌ [{source.name}] 실패\n{traceback.format_exc()}")
+            ok = False
+        print(f"⏱️ [{source.name}] {time.monotonic() - started:.1f}s")
+        return ok
+
+async def run_all(source_list, per_host=PER_HOST, max_workers=MAX_WORKERS):
+    """모든 소스를 동시에 실행하고 {이름: 성공 여부}를 반환"""
+    limits = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="source") as pool:
+        tasks = []
+        for source in source_list:
+            # Semaphore는 실행 중인 루프 안에서 만들어야 함 (Python 3.9)
+            limit = limits.setdefault(source.host, asyncio.Semaphore(per_host))
+            tasks.append(run_source(source, limit, pool))
+        results = await asyncio.gather(*tasks)
+    return {source.name: ok for source, ok in zip(source_list, results)}
+
+def run(only=None, per_host=PER_HOST):
+    source_list = sources.load_sources()
+    if only:
+        source_list = [s for s in source_list if s.name in only]
+    print(f"🚀 게시판 {len(source_list)}개 동시 실행 (host당 {per_host}개)")
+
+    results = asyncio.run(run_all(source_list, per_host))
+    telegram_queue.flush(telegram_queue.FLUSH_TIMEOUT)
+
+    failed = [name for name, ok in results.items() if not ok]
+    if failed:
+        print(f"❌ 실패한 게시판: {', '.join(failed)}")
+    return failed
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 게시판을 동시에 모니터링")
+    parser.add_argument("--only", nargs="+", help="이 이름의 소스만 실행")
+    parser.add_argument("--per-host", type=int, default=PER_HOST, help="같은 host에 동시에 돌리는 소스 수")
+    args = parser.parse_args()
+
+    if run(args.only, args.per_host):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""공지 검색 (archive.db 색인 사용, 사이트 검색을 거치지 않음)
+
+monitor.py / dorm_monitor.py 가 본 모든 글이 쌓여 있습니다.
+
+    python search.py 학점교류
+    python search.py 장학 신청 --source notice -n 50
+"""
+import sys
+import time
+import argparse
+
+import archive
+
+def format_result(post):
+    parts = [post["posted"] or "날짜 미상", f"[{post['source']}]"]
+    if post["department"]:
+        parts.append(post["department"])
+    return " ".join(parts) + f"\n   {post['title']}\n   {post['link']}"
+
+def main():
+    parser = argparse.ArgumentParser(description="본 공지 전체에서 제목/본문 검색")
+    parser.add_argument("query", nargs="+", help="검색어 (띄어쓴 단어는 모두 포함)")
+    parser.add_argument("-n", "--limit", type=int, default=20)
+    parser.add_argument("--source", help="notice / dorm / 학과 게시판 이름")
+    args = parser.parse_args()
+
+    store = archive.open_archive()
+    started = time.perf_counter()
+    results = store.search(" ".join(args.query), args.limit, args.source)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    for post in results:
+        print(format_result(post))
+    print(f"🔎 {len(results)}건 ({elapsed:.1f}ms)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+import os
+import abc
+import json
+import importlib
+from urllib.parse import urlsplit
+
+import archive
+import fetch_cache
+import http_client
+import state_store
+import subscribers
+import telegram_queue
+import metrics
+
+# 학과/단과대 게시판 목록 (runner.py가 기본 공지/기숙사와 함께 동시에 돌림)
+#  {
+#    "boards": [
+#      {"name": "ce", "label": "컴퓨터정보공학부", "url": "https://ce.kw.ac.kr/notice/...jsp"}
+#    ]
+#  }
+SOURCES_FILE = os.environ.get('SOURCES_FILE', 'sources.json')
+
+class Source(abc.ABC):
+    """게시판 하나 = 소스 하나
+
+    runner.py는 소스마다 run()을 스레드 풀에서 실행하고, host가 같은 소스끼리는
+    동시에 몇 개까지만 돌도록 제한합니다.
+    """
+
+    name = None
+    url = None
+
+    @property
+    def host(self):
+        return urlsplit(self.url).netloc
+
+    @abc.abstractmethod
+    def run(self):
+        pass
+
+class ModuleSource(Source):
+    """run()만 있는 모듈을 그대로 소스로 사용 (모닝 브리핑처럼 게시판이 아닌 작업)
+
+    모듈은 처음 쓸 때 import합니다.
+    """
+
+    def __init__(self, name, module_name, url_attr):
+        self.name = name
+        self.module_name = module_name
+        self.url_attr = url_attr
+
+    @property
+    def module(self):
+        return importlib.import_module(self.module_name)
+
+    @property
+    def url(self):
+        return getattr(self.module, self.url_attr)
+
+    def run(self):
+        self.module.run()
+
+class BoardSource(Source):
+    """fetch → parse → 비교 → 알림 → 저장 공통 흐름
+
+    하위 클래스는 fetch/extract/notify만 구현하면 되고, 공지/기숙사처럼 추가 작업이 있으면
+    open_seen / parse / content_hash / unchanged / should_notify / sync 를 덮어씁니다.
+    """
+
+    def __init__(self, name, url, label=None):
+        self.name = name
+        self.url = url
+        self.label = label or name
+
+    def open_seen(self):
+        return state_store.open_store(self.name)
+
+    @abc.abstractmethod
+    def fetch(self, cache, seen):
+        """응답을 반환 (cache: 지난 응답의 ETag/Last-Modified/해시)"""
+
+    def parse(self, response):
+        """빠른 경로 비교와 extract()에 넘길 문서 (기본: 응답 본문 문자열)"""
+        return response.text
+
+    def content_hash(self, doc):
+        return fetch_cache.content_hash(doc)
+
+    def unchanged(self, m):
+        """목록이 그대로라 빠른 경로로 끝날 때 할 일"""
+
+    @abc.abstractmethod
+    def extract(self, doc, seen):
+        """문서에서 글 목록(dict: id, title, link ...)을 뽑음"""
+
+    def post_id(self, post):
+        return post["id"]
+
+    def should_notify(self, post):
+        """처음 보는 글 중 알릴 글인지 (기본: 전부)"""
+        return True
+
+    def sync(self, m, new_posts):
+        """새 글이 정해진 뒤, 알림 전에 할 일 (본문 보관 등)"""
+
+    @abc.abstractmethod
+    def notify(self, posts):
+        pass
+
+    def run(self):
+        with metrics.job(self.name) as m:
+            seen = self.open_seen()
+            first_run = seen.is_empty()
+            # 기준점이 있을 때만 조건부 요청 (304 또는 목록 해시가 같으면 파싱/비교/저장 생략)
+            cache = fetch_cache.load(self.name) if not first_run else {}
+
+            with m.stage("fetch"):
+                response = self.fetch(cache, seen)
+                m.count("bytes_downloaded", len(response.content))
+                m.count("pages_fetched")
+
+            if response.status_code == 304:
+                m.set("fast_path", 1)
+                print(f"⚡ [{self.label}] 변경 없음 (304 Not Modified): 빠른 경로로 종료")
+                self.unchanged(m)
+                return
+            # 재시도 후에도 5xx/429면 http_client가 그 응답을 돌려줌 → 장애 페이지를 목록으로 저장하지 않음
+            response.raise_for_status()
+
+            with m.stage("parse"):
+                doc = self.parse(response)
+            digest = self.content_hash(doc)
+            if cache and digest == cache.get("hash"):
+                m.set("fast_path", 1)
+                fetch_cache.save(self.name, fetch_cache.make_entry(response, digest))
+                print(f"⚡ [{self.label}] 변경 없음 (목록 해시 동일): 빠른 경로로 종료")
+                self.unchanged(m)
+                return
+
+            # 다음 페이지를 더 가져오는 소스는 그 요청 시간도 여기에 포함됨 (pages_fetched 참고)
+            with m.stage("parse"):
+                posts = self.extract(doc, seen)
+            m.set("posts_extracted", len(posts))
+
+            with m.stage("diff"):
+                new_posts = []
+                for post in posts:
+                    # add()가 False면 이미 본 글 (여러 페이지에 걸쳐 같은 글이 보여도 한 번만 처리)
+                    if not seen.add(self.post_id(post)) or first_run or not self.should_notify(post):
+                        continue
+                    print(f"🚀 [{self.label}] 새 글: {post['title']}")
+                    new_posts.append(post)
+            m.set("new_items", len(new_posts))
+
+            self.sync(m, new_posts)
+
+            failed_before = telegram_queue.failed_count()
+            self.notify(new_posts)
+
+            with m.stage("state_write"):
+                written = seen.commit()
+                fetch_cache.save(self.name, fetch_cache.make_entry(response, digest))
+            print(f"💾 [{self.label}] 기록 추가 {written}개" + (" (첫 실행: 기준점)" if first_run else ""))
+
+            # 큐에 넣은 메시지가 실제로 나갈 때까지 기다리며 실패 건수 기록
+            with m.stage("send"):
+                m.set("send_failures", len(telegram_queue.flush(telegram_queue.FLUSH_TIMEOUT)) - failed_before)
+
+class KwBoardSource(BoardSource):
+    """광운대 홈페이지와 같은 게시판 틀(board-list-box)을 쓰는 학과/단과대 게시판
+
+    목록 추출(parse_posts)과 메시지 형식(build_message)은 monitor.py 것을 그대로 씁니다.
+    """
+
+    def __init__(self, name, url, label=None):
+        super().__init__(name, url, label)
+        parts = urlsplit(url)
+        self.site = f"{parts.scheme}://{parts.netloc}"
+
+    def fetch(self, cache, seen):
+        import monitor
+        return http_client.get(self.url, headers=dict(monitor.HEADERS, **fetch_cache.conditional_headers(cache)))
+
+    def content_hash(self, doc):
+        import monitor
+        return fetch_cache.content_hash(monitor.list_region(doc))
+
+    def extract(self, doc, seen):
+        import monitor
+        rows = {}
+        posts, _ = monitor.parse_posts(doc, seen, site=self.site, rows=rows)
+        store = archive.open_archive()
+        # 기준선 아래 행은 제목을 뽑지 않음(None): 색인에 아직 없는 글만 제목을 읽고, 나머지는 덮어쓰지 않도록 제외
+        titled = store.titled_keys(self.name, rows)
+        monitor.fill_titles(rows, {duid for duid in rows if str(duid) in titled})
+        store.index_posts(self.name, [
+            dict(row, key=duid, category=archive.title_category(row["title"])) for duid, row in rows.items() if row["title"]
+        ])
+        return posts
+
+    def notify(self, posts):
+        import monitor
+        if not posts or not monitor.TOKEN:
+            return
+        messages = {}
+        for chat_id, chat_posts in subscribers.fan_out(self.name, posts):
+            for post in chat_posts:
+                if post["id"] not in messages:
+                    messages[post["id"]] = monitor.build_message(f"[{self.label}] {post['title']}", post["link"], post["info"])
+                telegram_queue.enqueue(dict(messages[post["id"]], chat_id=chat_id))
+
+# 기본 게시판: (이름, 모듈, 클래스). 고른 것만 import (기숙사만 돌릴 때 공지 모듈/HTML 파서를 불러오지 않음)
+BUILTIN_SOURCES = (
+    ("notice", "monitor", "NoticeSource"),
+    ("dorm", "dorm_monitor", "DormSource"),
+)
+
+def builtin_sources(names=None):
+    return [getattr(importlib.import_module(module), cls)()
+            for name, module, cls in BUILTIN_SOURCES if names is None or name in names]
+
+def board_sources(path=SOURCES_FILE, taken=()):
+    """sources.json의 학과/단과대 게시판 (taken: 이미 쓰인 이름)"""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            boards = json.load(f).get("boards", [])
+    except (ValueError, OSError) as e:
+        print(f"⚠️ 게시판 목록을 읽지 못했습니다: {e}")
+        return []
+    names = set(taken)
+    sources = []
+    for board in boards:
+        if board["name"] in names:
+            print(f"⚠️ 게시판 이름 중복: {board['name']}")
+            continue
+        names.add(board["name"])
+        sources.append(KwBoardSource(board["name"], board["url"], board.get("label")))
+    return sources
+
+def load_sources(path=SOURCES_FILE):
+    sources = builtin_sources()
+    return sources + board_sources(path, [s.name for s in sources])
@@ -0,0 +1,141 @@
+import os
+import threading
+from datetime import datetime, timedelta
+
+# 두 모니터가 같이 쓰는 "이미 본 글" 기록 (append-only 로그)
+#  한 줄 = "소스\t키\t처음 본 날짜"  → 새 글이 생길 때만 줄이 추가되므로 git diff도 추가분만 남음
+LOG_FILE = "seen.log"
+
+# 처음 본 날로부터 며칠 동안 기록을 유지할지 (지난 글이 목록에 다시 떠도 재전송하지 않도록 넉넉하게)
+RETENTION_DAYS = int(os.environ.get('STATE_RETENTION_DAYS', '365'))
+
+# 만료된 줄이 전체의 이 비율을 넘을 때만 파일을 새로 씀 (평소에는 append만)
+COMPACT_RATIO = 0.25
+
+DATE_FMT = "%Y-%m-%d"
+
+def _clean(value):
+    return str(value).replace("\t", " ").replace("\n", " ").strip()
+
+_stores = {}
+
+# 여러 소스가 동시에 돌 때(runner.py) 같은 seen.log에 쓰는 순서를 맞춤
+_file_lock = threading.Lock()
+
+def open_store(source, legacy_file=None):
+    """같은 프로세스 안에서는 소스별 저장소를 한 번만 읽고 계속 재사용 (데몬 모드)"""
+    store = _stores.get(source)
+    if store is None:
+        store = _stores[source] = SeenStore(source, legacy_file=legacy_file)
+    return store
+
+class SeenStore:
+    """소스(monitor, dorm ...)별로 본 글 키를 O(1)로 조회하는 저장소
+
+    파일 전체를 dict(해시 인덱스)로 읽어두고, commit() 때 새로 본 키만 파일 끝에 덧붙입니다.
+    """
+
+    def __init__(self, source, path=LOG_FILE, legacy_file=None, retention_days=RETENTION_DAYS):
+        self.source = source
+        self.path = path
+        self.retention_days = retention_days
+        self.index = {}      # 이 소스의 키 → 처음 본 날짜
+        self._pending = []
+        self._expired = 0
+        self._other_lines = 0
+        self._load()
+
+        if legacy_file and not self.index and os.path.exists(legacy_file):
+            self._migrate(legacy_file)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        cutoff = self._cutoff()
+        with _file_lock, open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) != 3:
+                    continue
+                source, key, seen_at = parts
+                if source != self.source:
+                    self._other_lines += 1
+                elif seen_at < cutoff:
+                    self._expired += 1
+                else:
+                    self.index[key] = seen_at
+
+    def _cutoff(self):
+        return (datetime.utcnow() - timedelta(days=self.retention_days)).strftime(DATE_FMT)
+
+    def _migrate(self, legacy_file):
+        """예전 data.txt / dorm_data.txt (한 줄에 키 하나)를 가져오고 원본은 지움"""
+        with open(legacy_file, "r", encoding="utf-8") as f:
+            keys = [line.strip() for line in f if line.strip()]
+        for key in keys:
+            self.add(key)
+        self.commit()
+        os.remove(legacy_file)
+        print(f"📦 {legacy_file} → {self.path} 이전 완료 ({len(keys)}개)")
+
+    def __contains__(self, key):
+        return _clean(key) in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def is_empty(self):
+        return not self.index
+
+    def add(self, key):
+        """처음 보는 키면 기록하고 True 반환"""
+        key = _clean(key)
+        if key in self.index:
+            return False
+        today = datetime.utcnow().strftime(DATE_FMT)
+        self.index[key] = today
+        self._pending.append(key)
+        return True
+
+    def rekey(self, convert):
+        """키 형식이 바뀔 때 한 번만: 모든 키를 convert()로 바꾸고 파일을 새로 씀"""
+        new_index = {}
+        for key, seen_at in self.index.items():
+            new_key = _clean(convert(key))
+            if new_key not in new_index or seen_at < new_index[new_key]:
+                new_index[new_key] = seen_at
+        self.index = new_index
+        self._pending = []
+        self._compact()
+        print(f"📦 {self.source}: 키 형식 변환 완료 ({len(new_index)}개)")
+
+    def commit(self):
+        """새로 본 키만 파일 끝에 추가 (만료된 줄이 많이 쌓였으면 한 번 압축)"""
+        total = len(self.index) + self._other_lines + self._expired
+        if self._expired and self._expired > total * COMPACT_RATIO:
+            self._compact()
+        elif self._pending:
+            with _file_lock, open(self.path, "a", encoding="utf-8") as f:
+                for key in self._pending:
+                    f.write(f"{self.source}\t{key}\t{self.index[key]}\n")
+        written = len(self._pending)
+        self._pending = []
+        return written
+
+    def _compact(self):
+        with _file_lock:
+            self._rewrite()
+
+    def _rewrite(self):
+        # 다른 소스의 줄은 (같은 프로세스의 다른 저장소가 그 사이 추가했을 수 있으니) 지금 파일에서 다시 읽음
+        others = []
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                others = [line for line in f if not line.startswith(self.source + "\t")]
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(others)
+            for key, seen_at in self.index.items():
+                f.write(f"{self.source}\t{key}\t{seen_at}\n")
+        os.replace(tmp_path, self.path)
+        self._expired = 0
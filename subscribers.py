@@ -0,0 +1,164 @@
+import os
+import json
+from collections import deque
+
+# 구독자 목록 파일 (없으면 예전처럼 TELEGRAM_CHAT_ID 한 곳으로만 보냄)
+#  {
+#    "subscribers": [
+#      {"chat_id": "-1001234", "categories": ["장학", "채용"]},
+#      {"chat_id": "5678", "keywords": ["[국제교류]", "교환학생"], "sources": ["notice"]},
+#      {"chat_id": "-1009999", "all": true}
+#    ]
+#  }
+SUBSCRIBERS_FILE = os.environ.get('SUBSCRIBERS_FILE', 'subscribers.json')
+DEFAULT_CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID')
+
+# 분류 이름 → (아이콘, 제목에 들어있으면 해당하는 단어들). 위에 있을수록 아이콘 우선순위가 높음
+CATEGORIES = [
+    ("장학", "💰", ("장학", "대출")),
+    ("학사", "📅", ("학사", "수업", "복학")),
+    ("행사", "🎉", ("행사", "축제", "특강")),
+    ("채용", "👔", ("채용", "모집", "인턴")),
+    ("국제", "✈️", ("국제", "교환")),
+    ("봉사", "❤️", ("봉사",)),
+    ("대회", "🏆", ("대회", "공모")),
+]
+DEFAULT_ICON = "📢"
+
+class KeywordMatcher:
+    """여러 단어를 한 번에 찾는 Aho-Corasick 오토마톤
+
+    단어가 몇 개든 제목을 한 번만 훑어서, 제목에 들어있는 모든 단어의 값(value)을 모아 돌려줍니다.
+    """
+
+    def __init__(self, keywords):
+        # keywords: {단어: 값} — 노드마다 goto(다음 글자 → 노드), fail, 끝나는 단어들의 값을 가짐
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [set()]
+        for word, value in keywords.items():
+            self._insert(word.lower(), value)
+        self._build()
+
+    def _insert(self, word, value):
+        node = 0
+        for ch in word:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+            node = nxt
+        self._out[node].add(value)
+
+    def _build(self):
+        # BFS로 실패 링크를 만들고, 실패 링크 쪽에서 끝나는 단어도 미리 합쳐 둠
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] |= self._out[self._fail[nxt]]
+                queue.append(nxt)
+
+    def find(self, text):
+        """text에 들어있는 모든 단어의 값을 set으로 반환"""
+        found = set()
+        node = 0
+        for ch in text.lower():
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            if self._out[node]:
+                found |= self._out[node]
+        return found
+
+class Router:
+    """새 글 제목 → 받아야 하는 채팅방 목록
+
+    모든 구독자의 단어를 하나의 KeywordMatcher로 컴파일해 두므로, 구독자가 수천 명이어도
+    글 하나당 제목을 한 번만 훑습니다.
+    """
+
+    def __init__(self, subscribers):
+        keyword_chats = {}
+        self.catch_all = {}   # 출처 → 모든 글을 받는 채팅방들
+        self._sources = {}    # 채팅방 → 받을 출처 (None이면 전부)
+        category_words = {name: words for name, _, words in CATEGORIES}
+
+        for sub in subscribers:
+            chat_id = str(sub["chat_id"])
+            sources = sub.get("sources")
+            self._sources[chat_id] = set(sources) if sources else None
+            if sub.get("all"):
+                self.catch_all[chat_id] = True
+                continue
+            words = list(sub.get("keywords", []))
+            for name in sub.get("categories", []):
+                if name not in category_words:
+                    print(f"⚠️ 구독 설정: 알 수 없는 분류 '{name}' ({chat_id})")
+                    continue
+                words.extend(category_words[name])
+            for word in words:
+                if word.strip():
+                    keyword_chats.setdefault(word.strip().lower(), set()).add(chat_id)
+
+        # 단어마다 번호를 붙여 오토마톤에는 번호만 넣고, 번호 → 채팅방 목록은 따로 둠
+        self._chats_by_word = list(keyword_chats.values())
+        self.matcher = KeywordMatcher({word: idx for idx, word in enumerate(keyword_chats)})
+
+    def route(self, source, title):
+        chats = set(self.catch_all)
+        for idx in self.matcher.find(title):
+            chats |= self._chats_by_word[idx]
+        return [chat_id for chat_id in chats if self._wants(chat_id, source)]
+
+    def _wants(self, chat_id, source):
+        sources = self._sources.get(chat_id)
+        return sources is None or source in sources
+
+def load_subscribers(path=SUBSCRIBERS_FILE):
+    subs = []
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                subs = json.load(f).get("subscribers", [])
+        except (ValueError, OSError) as e:
+            print(f"⚠️ 구독자 파일을 읽지 못했습니다: {e}")
+    # 기존 채팅방은 설정이 없어도 항상 전체 글을 받음
+    if DEFAULT_CHAT_ID and not any(str(s.get("chat_id")) == str(DEFAULT_CHAT_ID) for s in subs):
+        subs.append({"chat_id": DEFAULT_CHAT_ID, "all": True})
+    return subs
+
+_router = None
+_router_mtime = None
+
+def get_router():
+    """컴파일한 Router를 재사용 (데몬 모드에서는 구독자 파일이 바뀌면 다시 컴파일)"""
+    global _router, _router_mtime
+    mtime = os.path.getmtime(SUBSCRIBERS_FILE) if os.path.exists(SUBSCRIBERS_FILE) else None
+    if _router is None or mtime != _router_mtime:
+        _router = Router(load_subscribers())
+        _router_mtime = mtime
+    return _router
+
+def category_icon(title):
+    for _, icon, words in CATEGORIES:
+        if any(word in title for word in words):
+            return icon
+    return DEFAULT_ICON
+
+def fan_out(source, posts):
+    """[(채팅방, 그 채팅방이 받을 글 목록)] — 글 순서는 그대로 유지"""
+    router = get_router()
+    by_chat = {}
+    for post in posts:
+        for chat_id in router.route(source, post["title"]):
+            by_chat.setdefault(chat_id, []).append(post)
+    return list(by_chat.items())
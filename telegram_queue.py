@@ -0,0 +1,200 @@
+import os
+import time
+import random
+import atexit
+import threading
+from collections import deque
+
+import requests
+
+# ▼ 설정 ▼
+API_BASE = os.environ.get('TELEGRAM_API_BASE', 'https://api.telegram.org')
+TOKEN = os.environ.get('TELEGRAM_TOKEN')
+
+# 텔레그램 전송 한도: 전체 초당 30건, 같은 채팅방 초당 1건, 그룹/채널은 분당 20건
+GLOBAL_PER_SEC = 30
+CHAT_INTERVAL = 1.0
+GROUP_INTERVAL = 3.0
+
+MAX_RETRIES = 5
+WORKERS = int(os.environ.get('TELEGRAM_WORKERS', '4'))
+
+# 한 번 실행에서 새 글이 이 개수 이상이면 하나의 묶음(digest) 메시지로 보냄 (0이면 사용 안 함)
+DIGEST_MIN = int(os.environ.get('TELEGRAM_DIGEST_MIN', '0'))
+
+# 실행 끝에서 큐가 빌 때까지 기다리는 최대 시간 (초)
+FLUSH_TIMEOUT = float(os.environ.get('TELEGRAM_FLUSH_TIMEOUT', '120'))
+
+# 메시지 최대 길이 4096자에서 여유를 둠
+MESSAGE_LIMIT = 4000
+
+class RateLimiter:
+    """여러 워커가 같이 쓰는 전체 전송 속도 제한 (토큰 버킷)"""
+
+    def __init__(self, per_sec):
+        self.per_sec = per_sec
+        self.tokens = float(per_sec)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.per_sec, self.tokens + (now - self.updated) * self.per_sec)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.per_sec
+            time.sleep(wait)
+
+class DeliveryQueue:
+    """sendMessage 요청을 백그라운드 워커로 보내는 큐
+
+    같은 채팅방은 항상 같은 워커가 맡아서 순서가 유지되고, 채팅방끼리는 병렬로 전송됩니다.
+    429면 retry_after 만큼, 5xx/네트워크 오류면 지수 백오프로 다시 시도합니다.
+    """
+
+    def __init__(self, token, workers=WORKERS, api_base=API_BASE):
+        self.url = f"{api_base}/bot{token}/sendMessage"
+        self.session = requests.Session()
+        self.limiter = RateLimiter(GLOBAL_PER_SEC)
+        self.failed = []
+        self.sent = 0
+        self._queues = [deque() for _ in range(workers)]
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._closed = False
+        self._threads = []
+        for idx in range(workers):
+            t = threading.Thread(target=self._worker, args=(idx,), name=f"telegram-{idx}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def enqueue(self, payload):
+        """payload(dict, chat_id 포함)를 큐에 넣고 바로 반환"""
+        chat_id = str(payload["chat_id"])
+        with self._cond:
+            self._queues[hash(chat_id) % len(self._queues)].append(payload)
+            self._pending += 1
+            self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """큐가 빌 때까지 기다리고, 끝내 전송하지 못한 payload 목록을 반환"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+        return list(self.failed)
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _worker(self, idx):
+        queue = self._queues[idx]
+        next_allowed = {}
+        while True:
+            with self._cond:
+                while not queue and not self._closed:
+                    self._cond.wait()
+                if not queue:
+                    return
+                payload = queue.popleft()
+
+            chat_id = str(payload["chat_id"])
+            wait = next_allowed.get(chat_id, 0) - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+            ok = self._deliver(payload)
+            interval = GROUP_INTERVAL if chat_id.startswith("-") else CHAT_INTERVAL
+            next_allowed[chat_id] = time.monotonic() + interval
+
+            with self._cond:
+                if ok:
+                    self.sent += 1
+                else:
+                    self.failed.append(payload)
+                self._pending -= 1
+                self._cond.notify_all()
+
+    def _deliver(self, payload):
+        for attempt in range(MAX_RETRIES):
+            self.limiter.acquire()
+            try:
+                res = self.session.post(self.url, data=payload, timeout=10)
+            except requests.RequestException as e:
+                print(f"텔레그램 전송 재시도 ({attempt + 1}/{MAX_RETRIES}): {e}")
+                time.sleep(_backoff(attempt))
+                continue
+
+            if res.status_code == 200:
+                return True
+
+            if res.status_code == 429:
+                try:
+                    retry_after = res.json().get("parameters", {}).get("retry_after", 1)
+                except ValueError:
+                    retry_after = 1
+                print(f"텔레그램 429: {retry_after}초 후 재시도")
+                time.sleep(retry_after)
+                continue
+
+            if res.status_code >= 500:
+                time.sleep(_backoff(attempt))
+                continue
+
+            # 400/403 등은 다시 보내도 실패하므로 바로 포기
+            print(f"텔레그램 전송 실패: {res.status_code} {res.text[:200]}")
+            return False
+
+        print(f"텔레그램 전송 실패: 재시도 {MAX_RETRIES}회 초과")
+        return False
+
+def _backoff(attempt):
+    return min(30, 2 ** attempt) * (0.5 + random.random() / 2)
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def get_queue():
+    """프로세스 전체에서 공유하는 전송 큐 (종료 시 남은 메시지를 모두 보냄)"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = DeliveryQueue(TOKEN)
+            atexit.register(_queue.close)
+        return _queue
+
+def enqueue(payload):
+    if not TOKEN:
+        return
+    get_queue().enqueue(payload)
+
+def flush(timeout=None):
+    if _queue is None:
+        return []
+    return _queue.flush(timeout)
+
+def failed_count():
+    return len(_queue.failed) if _queue is not None else 0
+
+def chunk_lines(lines, limit=MESSAGE_LIMIT):
+    """여러 줄을 메시지 길이 제한에 맞게 나눔 (묶음 메시지용)"""
+    chunks, current, size = [], [], 0
+    for line in lines:
+        if current and size + len(line) + 1 > limit:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks